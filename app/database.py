@@ -1,4 +1,5 @@
 # database.py
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship, create_engine, Session
 from typing import List, Optional, Set
 from datetime import datetime
@@ -6,6 +7,8 @@ from enum import Enum
 import math
 import os
 
+import numpy as np
+
 
 # Enums
 class CargoType(str, Enum):
@@ -17,6 +20,9 @@ class CargoType(str, Enum):
 
 # Database Models
 class Location(SQLModel, table=True):
+    # Coordinate lookups are bounding-box range scans on lat, then lng
+    __table_args__ = (Index("ix_location_lat_lng", "lat", "lng"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     lat: float = Field(description="Latitude coordinate")
     lng: float = Field(description="Longitude coordinate")
@@ -32,16 +38,37 @@ class Location(SQLModel, table=True):
         sa_relationship_kwargs={"foreign_keys": "[Route.location_destiny_id]"}
     )
 
+    def _radians(self):
+        """
+        (lat_rad, lng_rad, cos_lat) for the current coordinates, cached on the
+        instance and recomputed only when lat or lng has been changed
+        """
+        cached = self.__dict__.get('_radians_cache')
+        if cached is None or cached[0] != self.lat or cached[1] != self.lng:
+            lat_rad = math.radians(self.lat)
+            cached = (self.lat, self.lng, lat_rad, math.radians(self.lng), math.cos(lat_rad))
+            # Bypass SQLModel's setattr; this is not a column
+            object.__setattr__(self, '_radians_cache', cached)
+        return cached[2:]
+
     def distance_to(self, other: "Location") -> float:
         """Calculate distance to another location using Haversine formula"""
-        R = 6371  # Earth radius in km
-        lat1, lng1 = math.radians(self.lat), math.radians(self.lng)
-        lat2, lng2 = math.radians(other.lat), math.radians(other.lng)
-        dlat = lat2 - lat1
-        dlng = lng2 - lng1
-        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
+        lat1, lng1, cos_lat1 = self._radians()
+        lat2, lng2, cos_lat2 = other._radians()
+        a = math.sin((lat2 - lat1) * 0.5) ** 2 + cos_lat1 * cos_lat2 * math.sin((lng2 - lng1) * 0.5) ** 2
+        return 12742.0 * math.asin(math.sqrt(min(a, 1.0)))  # 2 * Earth radius in km
+
+    @classmethod
+    def distances_to_many(cls, lat0: float, lng0: float, lats, lngs) -> np.ndarray:
+        """
+        Haversine distances in km from (lat0, lng0) to every point of the
+        lats/lngs arrays, computed in one vectorized pass
+        """
+        phi0 = math.radians(lat0)
+        phi = np.radians(np.asarray(lats, dtype=np.float64))
+        dlam = np.radians(np.asarray(lngs, dtype=np.float64)) - math.radians(lng0)
+        a = np.sin((phi - phi0) / 2) ** 2 + math.cos(phi0) * np.cos(phi) * np.sin(dlam / 2) ** 2
+        return 2 * 6371 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
 
 
 class Client(SQLModel, table=True):
@@ -108,6 +135,13 @@ class Cargo(SQLModel, table=True):
 
 
 class Order(SQLModel, table=True):
+    # Orders are looked up by route (API) and by client and contract type
+    # (contract and example order seeding)
+    __table_args__ = (
+        Index("ix_order_route_client_contract", "route_id", "client_id", "contract_type"),
+        Index("ix_order_client_contract", "client_id", "contract_type"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
 
     # Location references - using the new Location entity
@@ -147,6 +181,11 @@ class Order(SQLModel, table=True):
 
 
 class Route(SQLModel, table=True):
+    # Routes are looked up by origin, or by origin and destination
+    __table_args__ = (
+        Index("ix_route_origin_dest", "location_origin_id", "location_destiny_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
 
     # Location references
@@ -183,13 +222,52 @@ class Route(SQLModel, table=True):
         """Distance from origin to destination"""
         return self.location_origin.distance_to(self.location_destiny)
     
+    def _path_arrays(self):
+        """
+        Waypoint latitudes and longitudes as float64 arrays, cached until any
+        waypoint coordinate changes (waypoints can be replaced or edited in place)
+        """
+        path = getattr(self, 'path', None) or []
+        coords = tuple((p.lat, p.lng) for p in path)
+        cached = self.__dict__.get('_path_coords')
+        if cached is None or cached[0] != coords:
+            lats = np.array([c[0] for c in coords], dtype=np.float64)
+            lngs = np.array([c[1] for c in coords], dtype=np.float64)
+            cached = (coords, lats, lngs)
+            object.__setattr__(self, '_path_coords', cached)
+        return cached[1], cached[2]
+
+    def _route_point_index(self):
+        """
+        Origin, destination and path waypoints sorted by latitude, as
+        (lats, lngs) arrays, so a latitude band is found by binary search.
+        Cached until a waypoint or endpoint coordinate changes; _path_arrays
+        returns new arrays whenever a waypoint moves.
+        """
+        path_lats, path_lngs = self._path_arrays()
+        origin, destiny = self.location_origin, self.location_destiny
+        endpoints = (origin.lat, origin.lng, destiny.lat, destiny.lng)
+        cached = self.__dict__.get('_route_point_index_cache')
+        if cached is None or cached[0] is not path_lats or cached[1] != endpoints:
+            lats = np.concatenate(([origin.lat, destiny.lat], path_lats))
+            lngs = np.concatenate(([origin.lng, destiny.lng], path_lngs))
+            order = np.argsort(lats, kind='stable')
+            cached = (path_lats, endpoints, lats[order], lngs[order])
+            object.__setattr__(self, '_route_point_index_cache', cached)
+        return cached[2], cached[3]
+
     def total_distance(self) -> float:
         """Calculate total distance including all waypoints"""
         if hasattr(self, 'path') and self.path and len(self.path) >= 2:
-            total = 0.0
-            for i in range(len(self.path) - 1):
-                total += self.path[i].distance_to(self.path[i + 1])
-            return total
+            from utils.geom import NUMBA_AVAILABLE, path_length
+
+            lats, lngs = self._path_arrays()
+            if NUMBA_AVAILABLE:
+                return float(path_length(lats, lngs))
+            lat = np.radians(lats)
+            a = (np.sin(np.diff(lat) / 2) ** 2
+                 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(np.radians(lngs)) / 2) ** 2)
+            return float((2 * 6371 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))).sum())
         return self.base_distance()
     
     def total_time(self, base_speed_kmh: float = 80.0) -> float:
@@ -221,26 +299,29 @@ class Route(SQLModel, table=True):
         Checks against origin, destination, and any path waypoints
         """
         if isinstance(location_coords, tuple):
-            test_location = Location(lat=location_coords[0], lng=location_coords[1])
+            lat, lng = location_coords
         else:
-            test_location = location_coords
-        
-        # Check distance to origin
-        if self.location_origin.distance_to(test_location) <= km:
-            return True
-        
-        # Check distance to destination  
-        if self.location_destiny.distance_to(test_location) <= km:
-            return True
+            lat, lng = location_coords.lat, location_coords.lng
         
-        # Check distance to path waypoints if they exist
-        # Check if route has a path attribute (for testing)
-        if hasattr(self, 'path') and self.path:
-            for waypoint in self.path:
-                if waypoint.distance_to(test_location) <= km:
-                    return True
+        # Cheap bounding-box prefilter; a degree spans at least 111 km of
+        # latitude and 111 * cos(lat) km of longitude at the box's widest lat,
+        # so no point within km can fall outside it
+        dlat_max = km / 111.0
+        cos_lat = math.cos(math.radians(min(90.0, abs(lat) + dlat_max)))
+        dlng_max = km / (111.0 * cos_lat) if cos_lat > 1e-9 else 360.0
         
-        return False
+        # Origin, destination and path waypoints by latitude: binary search
+        # the latitude band, then test longitude and distance within it
+        lats, lngs = self._route_point_index()
+        lo = np.searchsorted(lats, lat - dlat_max, side='left')
+        hi = np.searchsorted(lats, lat + dlat_max, side='right')
+        band_lats, band_lngs = lats[lo:hi], lngs[lo:hi]
+        # Longitude differences are wrapped into [-180, 180) so points on the
+        # other side of the antimeridian are not dropped
+        near = np.abs((band_lngs - lng + 180.0) % 360.0 - 180.0) <= dlng_max
+        if not near.any():
+            return False
+        return bool(np.any(Location.distances_to_many(lat, lng, band_lats[near], band_lngs[near]) <= km))
     
     def deviation_time_for_stop(self, location_coords, avg_speed_kmh: float = 80.0) -> float:
         """
@@ -313,7 +394,8 @@ class Truck(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     autonomy: float = Field(description="Range in km")
     capacity: float = Field(description="Volume capacity")
-    type: str
+    # Indexed for the contract-truck prefix lookup in db_manager
+    type: str = Field(index=True)
 
     # Relationships
     routes: List[Route] = Relationship(back_populates="truck")
@@ -341,6 +423,10 @@ engine = create_engine(DATABASE_URL, echo=False)
 def create_tables():
     """Create all database tables"""
     SQLModel.metadata.create_all(engine)
+    # create_all skips the indexes of tables that already exist
+    for table in (Location.__table__, Truck.__table__, Route.__table__, Order.__table__):
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
 
 
 def get_session():
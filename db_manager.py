@@ -4,14 +4,16 @@ Unified Database Manager for Digital Freight Matcher
 Consolidates initialization logic from existing scripts with safe duplicate prevention.
 """
 
+import csv
 import logging
 import os
 import sys
+from collections import namedtuple
 from datetime import datetime
 from io import StringIO
 from typing import Dict, Tuple, Optional
 
-import pandas as pd
+from sqlalchemy import and_, func, or_
 from sqlmodel import Session, select
 
 # Add app directory to path
@@ -56,6 +58,44 @@ Drop Off Point,33.4735,-82.0105,
 Pick Up Point,32.0835,-81.0998,6
 Drop Off Point,31.5804,-84.1557,"""
 
+# Both tables parsed once at import into typed rows
+ContractRow = namedtuple(
+    'ContractRow',
+    'route anchor_point cargo_miles total_miles truck_cost pallets cargo_cost '
+    'empty_cargo_cost markup price_time price_cargo margin stop_count hours'
+)
+ExampleRow = namedtuple('ExampleRow', 'point_type lat lng packages_qty')
+
+_CONTRACT_INT_COLUMNS = {'route', 'pallets', 'stop_count'}
+
+CONTRACT_ROWS = tuple(
+    ContractRow(**{
+        column: value if column == 'anchor_point'
+        else int(value) if column in _CONTRACT_INT_COLUMNS
+        else float(value)
+        for column, value in row.items()
+    })
+    for row in csv.DictReader(StringIO(CONTRACT_DATA))
+)
+
+EXAMPLE_ROWS = tuple(
+    ExampleRow(
+        point_type=row['point_type'],
+        lat=float(row['lat']),
+        lng=float(row['lng']),
+        packages_qty=int(row['packages_qty']) if row['packages_qty'] else None
+    )
+    for row in csv.DictReader(StringIO(ORDER_EXAMPLES_DATA))
+)
+
+# Example rows alternate pickup and dropoff; pair them up once
+EXAMPLE_ORDER_PAIRS = tuple(zip(EXAMPLE_ROWS[0::2], EXAMPLE_ROWS[1::2]))
+if len(EXAMPLE_ROWS) % 2 or any(
+    pickup.point_type != "Pick Up Point" or dropoff.point_type != "Drop Off Point"
+    for pickup, dropoff in EXAMPLE_ORDER_PAIRS
+):
+    raise ValueError("ORDER_EXAMPLES_DATA rows must alternate pickup and dropoff points")
+
 # Georgia city coordinates
 CITY_COORDINATES = {
     "Atlanta": (33.7490, -84.3880),
@@ -66,6 +106,26 @@ CITY_COORDINATES = {
     "Columbus": (32.4609, -84.9877)
 }
 
+# Contract trucks are named "<prefix> #<n>". They are looked up as the index
+# range [prefix, prefix with its last character bumped), which a B-tree index
+# on truck.type can serve; a LIKE 'prefix%' pattern always scans. Unlike
+# SQLite's LIKE the range is case-sensitive: only trucks written with this
+# exact prefix (as _ensure_trucks writes them) are reused, and a differently
+# cased type such as "specialized contract truck #1" is not a contract truck.
+CONTRACT_TRUCK_PREFIX = "Specialized Contract Truck"
+CONTRACT_TRUCK_PREFIX_END = CONTRACT_TRUCK_PREFIX[:-1] + chr(ord(CONTRACT_TRUCK_PREFIX[-1]) + 1)
+
+# Entity tables in the order they are reported
+ENTITY_MODELS = (
+    ('clients', Client),
+    ('locations', Location),
+    ('trucks', Truck),
+    ('routes', Route),
+    ('orders', Order),
+    ('cargo', Cargo),
+    ('packages', Package),
+)
+
 # Current daily losses from business requirements
 DAILY_LOSSES = {
     1: -53.51,   # Ringgold
@@ -120,7 +180,7 @@ class DatabaseManager:
             create_tables()
 
             # Check existing data
-            existing_data, counts = self.check_existing_data()
+            counts = self.get_counts()
 
             if not force_reinit and self._is_database_initialized(counts):
                 logger.info("Database appears to be already initialized with contract data")
@@ -175,6 +235,16 @@ class DatabaseManager:
 
         return existing, counts
 
+    def get_counts(self) -> Dict[str, int]:
+        """Count the rows of every entity table without loading them"""
+        counts = {
+            name: self.session.exec(select(func.count()).select_from(model)).one()
+            for name, model in ENTITY_MODELS
+        }
+        logger.info(f"Existing data counts: {counts}")
+
+        return counts
+
     def verify_integrity(self) -> Dict[str, int]:
         """Verify database integrity and return entity counts"""
         try:
@@ -316,15 +386,26 @@ class DatabaseManager:
         """Find existing locations that match our city coordinates"""
         found_locations = {}
 
-        for city, (lat, lng) in CITY_COORDINATES.items():
-            # Look for locations within a small tolerance (0.001 degrees ≈ 100m)
-            tolerance = 0.001
-            location = self.session.exec(
-                select(Location).where(
+        # Look for locations within a small tolerance (0.001 degrees ≈ 100m),
+        # fetching the candidates for every city in a single query
+        tolerance = 0.001
+        candidates = self.session.exec(
+            select(Location).where(or_(*(
+                and_(
                     Location.lat.between(lat - tolerance, lat + tolerance),
                     Location.lng.between(lng - tolerance, lng + tolerance)
                 )
-            ).first()
+                for lat, lng in CITY_COORDINATES.values()
+            ))).order_by(Location.id)
+        ).all()
+
+        for city, (lat, lng) in CITY_COORDINATES.items():
+            location = next(
+                (candidate for candidate in candidates
+                 if lat - tolerance <= candidate.lat <= lat + tolerance
+                 and lng - tolerance <= candidate.lng <= lng + tolerance),
+                None
+            )
 
             if location:
                 found_locations[city] = location
@@ -354,12 +435,16 @@ class DatabaseManager:
     def _ensure_trucks(self):
         """Ensure required trucks exist"""
         existing_trucks = self.session.exec(
-            select(Truck).where(Truck.type.like("Specialized Contract Truck%"))
+            select(Truck)
+            .where(Truck.type >= CONTRACT_TRUCK_PREFIX,
+                   Truck.type < CONTRACT_TRUCK_PREFIX_END)
+            .order_by(Truck.id)
+            .limit(5)  # at most 5 are ever reused
         ).all()
 
         if len(existing_trucks) >= 5:
             logger.info(f"Found {len(existing_trucks)} existing contract trucks")
-            self.trucks = existing_trucks[:5]
+            self.trucks = existing_trucks
             return
 
         # Create missing trucks
@@ -370,7 +455,7 @@ class DatabaseManager:
             truck = Truck(
                 autonomy=800.0,
                 capacity=48.0,
-                type=f"Specialized Contract Truck #{i}"
+                type=f"{CONTRACT_TRUCK_PREFIX} #{i}"
             )
             self.session.add(truck)
             self.trucks.append(truck)
@@ -385,20 +470,26 @@ class DatabaseManager:
 
         # Check for existing routes from Atlanta
         existing_routes = self.session.exec(
-            select(Route).where(Route.location_origin_id == atlanta.id)
+            select(Route)
+            .where(Route.location_origin_id == atlanta.id)
+            .order_by(Route.id)
+            .limit(5)  # at most 5 are ever reused
         ).all()
 
         if len(existing_routes) >= 5:
             logger.info(f"Found {len(existing_routes)} existing routes from Atlanta")
-            self.routes = existing_routes[:5]
+            self.routes = existing_routes
             return
 
-        # Create missing routes
-        df = pd.read_csv(StringIO(CONTRACT_DATA))
+        # First existing route to each destination
+        routes_by_destination = {}
+        for existing_route in existing_routes:
+            routes_by_destination.setdefault(existing_route.location_destiny_id, existing_route)
 
-        for idx, row in df.iterrows():
-            route_num = int(row['route'])
-            anchor_point = row['anchor_point']
+        # Create missing routes
+        for idx, row in enumerate(CONTRACT_ROWS):
+            route_num = row.route
+            anchor_point = row.anchor_point
 
             destination = self.locations.get(anchor_point)
             if not destination:
@@ -406,12 +497,7 @@ class DatabaseManager:
                 continue
 
             # Check if this specific route already exists
-            existing_route = self.session.exec(
-                select(Route).where(
-                    Route.location_origin_id == atlanta.id,
-                    Route.location_destiny_id == destination.id
-                )
-            ).first()
+            existing_route = routes_by_destination.get(destination.id)
 
             if existing_route:
                 logger.info(f"Route {route_num} already exists: Atlanta -> {anchor_point}")
@@ -443,22 +529,18 @@ class DatabaseManager:
             logger.warning("No contract client found, skipping contract orders")
             return
 
-        df = pd.read_csv(StringIO(CONTRACT_DATA))
+        # Routes that already carry a contract order, fetched in one query
+        routes_with_orders = set(self.session.exec(
+            select(Order.route_id).where(
+                Order.client_id == contract_client.id,
+                Order.contract_type == "4-year binding contract"
+            )
+        ).all())
 
-        for idx, (route, row) in enumerate(zip(self.routes, df.iterrows())):
-            _, data = row
-            pallets = int(data['pallets'])
+        for idx, (route, row) in enumerate(zip(self.routes, CONTRACT_ROWS)):
+            pallets = row.pallets
 
-            # Check if contract order already exists for this route
-            existing_order = self.session.exec(
-                select(Order).where(
-                    Order.route_id == route.id,
-                    Order.client_id == contract_client.id,
-                    Order.contract_type == "4-year binding contract"
-                )
-            ).first()
-
-            if existing_order:
+            if route.id in routes_with_orders:
                 logger.info(f"Contract order already exists for route {idx+1}")
                 continue
 
@@ -470,23 +552,19 @@ class DatabaseManager:
                 route_id=route.id,
                 contract_type="4-year binding contract"
             )
-            self.session.add(order)
-            self.session.flush()
-
-            # Create cargo for the order
-            cargo = Cargo(order_id=order.id, truck_id=route.truck_id)
-            self.session.add(cargo)
-            self.session.flush()
 
-            # Create packages based on pallet count
-            for pallet_num in range(pallets):
-                package = Package(
+            # Link cargo and packages through relationships so their
+            # foreign keys are filled in when the session next flushes
+            cargo = Cargo(order=order, truck_id=route.truck_id)
+            cargo.packages = [
+                Package(
                     volume=1.0,  # 1 cubic meter per pallet
                     weight=500.0,  # 500kg per pallet
-                    type=CargoType.STANDARD,
-                    cargo_id=cargo.id
+                    type=CargoType.STANDARD
                 )
-                self.session.add(package)
+                for _ in range(pallets)
+            ]
+            self.session.add(order)
 
             logger.info(f"Created contract order for route {idx+1}: {pallets} pallets")
 
@@ -510,65 +588,52 @@ class DatabaseManager:
                 logger.info(f"Found {len(existing_example_orders)} existing example orders")
                 return
         else:
-            # Create example client
+            # Create example client; it is inserted with its orders
             example_client = Client(name="Example Client")
             self.session.add(example_client)
-            self.session.flush()
             self.clients["example"] = example_client
 
         # Create example orders from order examples data
-        df = pd.read_csv(StringIO(ORDER_EXAMPLES_DATA))
-
-        pickup_row = None
         order_count = 0
 
-        for idx, row in df.iterrows():
-            point_type = row['point_type']
-
-            if point_type == "Pick Up Point":
-                pickup_row = row
-            elif point_type == "Drop Off Point" and pickup_row is not None:
-                # Create pickup and dropoff locations
-                pickup_loc = create_location(
-                    self.session,
-                    lat=pickup_row['lat'],
-                    lng=pickup_row['lng']
-                )
+        # Points shared by several examples get a single location row
+        location_cache = {}
+
+        def get_or_create_location(lat: float, lng: float) -> Location:
+            key = (round(lat, 6), round(lng, 6))
+            location = location_cache.get(key)
+            if location is None:
+                location = Location(lat=lat, lng=lng)
+                location_cache[key] = location
+            return location
+
+        # Rows are linked through relationships and written by the commit,
+        # so no flush is needed to learn their ids
+        for pickup, dropoff in EXAMPLE_ORDER_PAIRS:
+            # Create order between the pickup and dropoff locations
+            order = Order(
+                location_origin=get_or_create_location(pickup.lat, pickup.lng),
+                location_destiny=get_or_create_location(dropoff.lat, dropoff.lng),
+                client=example_client
+            )
 
-                dropoff_loc = create_location(
-                    self.session,
-                    lat=row['lat'],
-                    lng=row['lng']
-                )
+            # Create cargo with packages if quantity specified
+            package_qty = pickup.packages_qty
+            if package_qty:
+                cargo = Cargo(order=order)
+                cargo.packages = [
+                    Package(
+                        volume=1.0,  # 1 cubic meter default
+                        weight=25.0,  # 25 kg default
+                        type=CargoType.STANDARD
+                    )
+                    for _ in range(package_qty)
+                ]
+
+            # Adding the order cascades to its locations, cargo and packages
+            self.session.add(order)
 
-                # Create order
-                order = Order(
-                    location_origin_id=pickup_loc.id,
-                    location_destiny_id=dropoff_loc.id,
-                    client_id=example_client.id
-                )
-                self.session.add(order)
-                self.session.flush()
-
-                # Create cargo with packages if quantity specified
-                package_qty = pickup_row.get('packages_qty', 0)
-                if pd.notna(package_qty) and package_qty > 0:
-                    cargo = Cargo(order_id=order.id)
-                    self.session.add(cargo)
-                    self.session.flush()
-
-                    # Create packages
-                    for _ in range(int(package_qty)):
-                        package = Package(
-                            volume=1.0,  # 1 cubic meter default
-                            weight=25.0,  # 25 kg default
-                            type=CargoType.STANDARD,
-                            cargo_id=cargo.id
-                        )
-                        self.session.add(package)
-
-                order_count += 1
-                pickup_row = None
+            order_count += 1
 
         logger.info(f"Created {order_count} example orders")
 
@@ -103,7 +103,7 @@ def haversine_distance(lat1, lng1, lat2, lng2) -> float:
     a = (math.sin(dlat/2)**2 +
          math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
          math.sin(dlng/2)**2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    c = 2 * math.asin(math.sqrt(min(a, 1.0)))
     return R * c
 ```
 
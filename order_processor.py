@@ -10,7 +10,8 @@ Implements order validation and constraint checking with business rules:
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional, Tuple
+import numpy as np
 from schemas.schemas import Order, Route, Truck, Location
 
 
@@ -88,7 +89,8 @@ class OrderProcessor:
     def __init__(self):
         self.constants = OrderProcessingConstants()
 
-    def validate_order_for_route(self, order: Order, route: Route, truck: Truck) -> ProcessingResult:
+    def validate_order_for_route(self, order: Order, route: Route, truck: Truck,
+                                 metrics_level: Literal["score", "full"] = "full") -> ProcessingResult:
         """
         Comprehensive order validation for a specific route and truck
 
@@ -96,6 +98,8 @@ class OrderProcessor:
             order: Order to validate
             route: Target route
             truck: Assigned truck
+            metrics_level: "full" for all metrics, "score" for only those used
+                by the efficiency score
 
         Returns:
             ProcessingResult with validation status and details
@@ -124,7 +128,7 @@ class OrderProcessor:
             errors.append(cargo_result)
 
         # Calculate metrics
-        metrics = self._calculate_order_metrics(order, route, truck)
+        metrics = self._calculate_order_metrics(order, route, truck, level=metrics_level)
 
         return ProcessingResult(
             is_valid=len(errors) == 0,
@@ -379,29 +383,34 @@ class OrderProcessor:
         # Return total additional distance (round trip for deviations)
         return 2 * (origin_deviation + destiny_deviation)
 
-    def _calculate_order_metrics(self, order: Order, route: Route, truck: Truck) -> Dict[str, float]:
+    def _calculate_order_metrics(self, order: Order, route: Route, truck: Truck,
+                                 level: Literal["score", "full"] = "full") -> Dict[str, float]:
         """
         Calculate comprehensive metrics for the order
+
+        With level="score" only the utilization, deviation and cost metrics
+        consumed by _calculate_efficiency_score are computed.
         """
         metrics = {}
 
-        # Volume metrics
         order_volume_m3 = order.total_volume()
         order_volume_cf = order_volume_m3 / self.constants.CUBIC_FEET_TO_CUBIC_METERS
-        metrics['order_volume_m3'] = order_volume_m3
-        metrics['order_volume_cf'] = order_volume_cf
-
-        # Weight metrics
         order_weight_kg = order.total_weight()
         order_weight_lbs = order_weight_kg / self.constants.LBS_TO_KG
-        metrics['order_weight_kg'] = order_weight_kg
-        metrics['order_weight_lbs'] = order_weight_lbs
 
-        # Distance metrics
-        order_distance_km = order.total_distance()
-        order_distance_miles = order_distance_km * self.constants.KM_TO_MILES
-        metrics['order_distance_km'] = order_distance_km
-        metrics['order_distance_miles'] = order_distance_miles
+        if level == "full":
+            # Volume metrics
+            metrics['order_volume_m3'] = order_volume_m3
+            metrics['order_volume_cf'] = order_volume_cf
+
+            # Weight metrics
+            metrics['order_weight_kg'] = order_weight_kg
+            metrics['order_weight_lbs'] = order_weight_lbs
+
+            # Distance metrics
+            order_distance_km = order.total_distance()
+            metrics['order_distance_km'] = order_distance_km
+            metrics['order_distance_miles'] = order_distance_km * self.constants.KM_TO_MILES
 
         # Capacity utilization
         truck_volume_cf = truck.capacity / self.constants.CUBIC_FEET_TO_CUBIC_METERS
@@ -420,25 +429,38 @@ class OrderProcessor:
 
         return metrics
 
-    def process_order_batch(self, orders: List[Order], routes: List[Route], trucks: List[Truck]) -> Dict[int, ProcessingResult]:
+    def process_order_batch(self, orders: List[Order], routes: List[Route], trucks: List[Truck],
+                            route_points: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+                            ) -> Dict[int, ProcessingResult]:
         """
         Process multiple orders against available routes and trucks
 
+        Args:
+            route_points: route_point_arrays(routes[:len(trucks)]), for callers
+                that process many batches against the same fleet
+
         Returns:
             Dictionary mapping order IDs to their processing results
         """
         results = {}
-
-        for order in orders:
+        # Pairs that cannot pass the proximity check are never valid, so skip them
+        candidates = None
+        if routes and trucks:
+            if route_points is None:
+                route_points = self.route_point_arrays(routes[:len(trucks)])
+            candidates = self._proximity_candidates(orders, route_points)
+
+        for order_index, order in enumerate(orders):
             order_id = order.id or id(order)
             best_result = None
             best_score = -1
+            best_pair = None
 
-            # Try each route-truck combination
+            # Try each route-truck combination, computing only scoring metrics
             for i, route in enumerate(routes):
-                if i < len(trucks):
+                if i < len(trucks) and candidates[order_index, i]:
                     truck = trucks[i]
-                    result = self.validate_order_for_route(order, route, truck)
+                    result = self.validate_order_for_route(order, route, truck, metrics_level="score")
 
                     if result.is_valid:
                         # Score based on efficiency metrics
@@ -446,26 +468,78 @@ class OrderProcessor:
                         if score > best_score:
                             best_score = score
                             best_result = result
+                            best_pair = (route, truck)
+
+            # Fill in the full metrics only for the chosen match
+            if best_pair is not None:
+                best_result.metrics = self._calculate_order_metrics(order, *best_pair)
 
             # If no valid route found, return the validation result from the first route
             if best_result is None:
                 if routes and trucks:
                     best_result = self.validate_order_for_route(order, routes[0], trucks[0])
                 else:
-                    best_result = ProcessingResult(
-                        is_valid=False,
-                        errors=[ValidationError(
-                            result=ValidationResult.INVALID_PROXIMITY,
-                            message="No routes or trucks available",
-                            details={"no_resources": True}
-                        )],
-                        metrics={}
-                    )
+                    best_result = self._no_resources_result()
 
             results[order_id] = best_result
 
         return results
 
+    def _proximity_candidates(self, orders: List[Order],
+                              route_points: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+        """
+        (orders, routes) mask of pairs that may pass _validate_proximity_constraint
+
+        Computed in one compiled pass over all pairs. The limit gets a tiny
+        tolerance so rounding never drops a pair the exact check would accept.
+        """
+        from utils.geom import proximity_mask
+
+        nan = float('nan')
+        pick_lat = np.empty(len(orders))
+        pick_lng = np.empty(len(orders))
+        drop_lat = np.empty(len(orders))
+        drop_lng = np.empty(len(orders))
+        for i, order in enumerate(orders):
+            if order.location_origin and order.location_destiny:
+                pick_lat[i] = order.location_origin.lat
+                pick_lng[i] = order.location_origin.lng
+                drop_lat[i] = order.location_destiny.lat
+                drop_lng[i] = order.location_destiny.lng
+            else:
+                pick_lat[i] = pick_lng[i] = drop_lat[i] = drop_lng[i] = nan
+
+        point_lat, point_lng, route_offsets = route_points
+        return proximity_mask(pick_lat, pick_lng, drop_lat, drop_lng,
+                              point_lat, point_lng, route_offsets,
+                              self.constants.MAX_PROXIMITY_KM + 1e-6)
+
+    @staticmethod
+    def route_point_arrays(routes: List[Route]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Points of each route as flat (lat, lng, offsets) arrays
+
+        Same points as the proximity check uses; route r's points are
+        lat/lng[offsets[r]:offsets[r + 1]].
+        """
+        point_lat = []
+        point_lng = []
+        route_offsets = np.zeros(len(routes) + 1, dtype=np.int64)
+        for r, route in enumerate(routes):
+            if hasattr(route, 'path') and route.path:
+                route_points = route.path
+            elif route.location_origin and route.location_destiny:
+                route_points = [route.location_origin, route.location_destiny]
+            else:
+                route_points = []
+            for point in route_points:
+                point_lat.append(point.lat)
+                point_lng.append(point.lng)
+            route_offsets[r + 1] = len(point_lat)
+
+        return (np.array(point_lat, dtype=np.float64), np.array(point_lng, dtype=np.float64),
+                route_offsets)
+
     def process_order_batch_v2(self, orders: List[Order], routes: List[Route], trucks: List[Truck]) -> Dict[int, ProcessingResult]:
         """
         NEW VERSION: Process multiple orders against available routes and trucks
@@ -480,18 +554,27 @@ class OrderProcessor:
                 result = self.validate_order_for_route(order, routes[0], trucks[0])
                 results[order_id] = result
             else:
-                results[order_id] = ProcessingResult(
-                    is_valid=False,
-                    errors=[ValidationError(
-                        result=ValidationResult.INVALID_PROXIMITY,
-                        message="No routes or trucks available",
-                        details={"no_resources": True}
-                    )],
-                    metrics={}
-                )
+                results[order_id] = self._no_resources_result()
 
         return results
 
+    def _no_resources_result(self) -> ProcessingResult:
+        """
+        Build the rejection result used when no routes or trucks are available
+
+        Built per order: results are mutable, so sharing one instance would let
+        an edit to one order's result show up in every other.
+        """
+        return ProcessingResult(
+            is_valid=False,
+            errors=[ValidationError(
+                result=ValidationResult.INVALID_PROXIMITY,
+                message="No routes or trucks available",
+                details={"no_resources": True}
+            )],
+            metrics={}
+        )
+
     def _calculate_efficiency_score(self, metrics: Dict[str, float]) -> float:
         """
         Calculate efficiency score for route selection
@@ -7,17 +7,67 @@ This test file demonstrates:
 2. Creating a street map using OSMNX
 3. Displaying the map with route visualization
 4. Closing the map when ESC key is pressed
+
+Set DFM_HEADLESS=1 to render without a GUI and save the map to a PNG
+(DFM_MAP_OUTPUT, default osmnx_test_map.png) instead. Set
+DFM_MAP_BACKEND=datashader to rasterize the map layers with datashader.
 """
 
-import osmnx as ox
-import matplotlib.pyplot as plt
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
 import numpy as np
-from matplotlib.patches import Circle
 import random
-from schemas.schemas import Location, Route, Truck, Order, Cargo, Package, CargoType
+from schemas.schemas import EARTH_RADIUS_KM, Location, Route, Truck, Order, Cargo, Package, CargoType
+
+# OSMNX (GeoPandas, Shapely, NetworkX) and Matplotlib are imported on first
+# use so the data summary in main() prints without paying their import cost.
+
+# Headless runs (CI, benchmarks) render with Agg and save a PNG instead of
+# starting a GUI backend and event loop.
+HEADLESS = bool(os.environ.get('DFM_HEADLESS'))
+HEADLESS_MAP_PATH = Path(os.environ.get('DFM_MAP_OUTPUT', 'osmnx_test_map.png'))
+
+# Road network cache: OSMNX caches raw Overpass responses, and the parsed
+# graphs are pickled per location so warm runs skip download and parsing.
+GRAPH_CACHE_DIR = Path(".osmnx_cache")
+
+# Rendered maps are cached as PNGs keyed by a hash of the data they show
+MAP_CACHE_DIR = Path(".map_cache")
+
+# Radius of road network downloaded around each location
+ROAD_NETWORK_RADIUS_M = 5000
+
+# Concurrent Overpass requests when fetching uncached per-location networks;
+# kept small to stay within Overpass rate limits
+MAX_CONCURRENT_DOWNLOADS = 4
+
+# Road edges shorter than this are invisible at map scale and are not drawn
+MIN_ROAD_EDGE_LENGTH_M = 200.0
+
+# Order status styling, indexed by the status id stored in OrderArrays.status_id
+STATUSES = ('pending', 'assigned', 'in_transit')
+STATUS_COLORS = np.array(['yellow', 'lightblue', 'lightgreen'])
+STATUS_MARKERS = ('^', 'D', 'v')
 
+# Label styles shared by every annotation of the same kind
+CITY_LABEL_BBOX = dict(boxstyle='round,pad=0.3', facecolor='white',
+                       edgecolor='darkred', alpha=0.9)
+STOP_LABEL_BBOX = dict(boxstyle='round,pad=0.2', facecolor='lightyellow',
+                       edgecolor='orange', alpha=0.8)
+
+@lru_cache(maxsize=1)
 def get_hardcoded_locations():
-    """Hardcoded location data simulating database values"""
+    """Hardcoded location data simulating database values (built once, read-only)"""
     locations = {
         'atlanta': Location(id=1, lat=33.7490, lng=-84.3880, marked=True),
         'augusta': Location(id=2, lat=33.4735, lng=-82.0105, marked=True),
@@ -34,10 +84,15 @@ def get_hardcoded_locations():
         'savannah_port': Location(id=11, lat=32.0900, lng=-81.0900, marked=False),
         'macon_center': Location(id=12, lat=32.8500, lng=-83.6400, marked=False),
     }
-    return locations
+    return MappingProxyType(locations)
+
+def get_location_coords(locations):
+    """Return location coordinates as an (N, 2) array of (lat, lng) rows"""
+    return np.array([(loc.lat, loc.lng) for loc in locations.values()], dtype=np.float64)
 
+@lru_cache(maxsize=1)
 def get_hardcoded_routes():
-    """Hardcoded route data simulating database values"""
+    """Hardcoded route data simulating database values (built once, read-only)"""
     locations = get_hardcoded_locations()
     
     routes = [
@@ -78,10 +133,11 @@ def get_hardcoded_routes():
             'current_load': 41.3,
         }
     ]
-    return routes
+    return tuple(routes)
 
+@lru_cache(maxsize=1)
 def get_hardcoded_orders():
-    """Hardcoded order data simulating database values"""
+    """Hardcoded order data simulating database values (built once, read-only)"""
     locations = get_hardcoded_locations()
     
     orders = [
@@ -118,23 +174,303 @@ def get_hardcoded_orders():
             'status': 'in_transit',
         }
     ]
-    return orders
+    return tuple(orders)
+
+# Column-oriented (SoA) views of the route and order data, one NumPy array per field
+RouteArrays = namedtuple('RouteArrays', 'ids names origin_lng origin_lat dest_lng dest_lat capacity load color')
+OrderArrays = namedtuple('OrderArrays', 'ids pickup_lng pickup_lat dropoff_lng dropoff_lat volume status status_id')
+
+@lru_cache(maxsize=1)
+def get_route_arrays():
+    """Hardcoded routes as parallel NumPy arrays"""
+    routes = get_hardcoded_routes()
+    return RouteArrays(
+        ids=np.array([r['id'] for r in routes]),
+        names=np.array([r['name'] for r in routes]),
+        origin_lng=np.array([r['origin'].lng for r in routes]),
+        origin_lat=np.array([r['origin'].lat for r in routes]),
+        dest_lng=np.array([r['destination'].lng for r in routes]),
+        dest_lat=np.array([r['destination'].lat for r in routes]),
+        capacity=np.array([r['truck_capacity'] for r in routes]),
+        load=np.array([r['current_load'] for r in routes]),
+        color=np.array([r['color'] for r in routes]),
+    )
+
+@lru_cache(maxsize=1)
+def get_order_arrays():
+    """Hardcoded orders as parallel NumPy arrays"""
+    orders = get_hardcoded_orders()
+    return OrderArrays(
+        ids=np.array([o['id'] for o in orders]),
+        pickup_lng=np.array([o['pickup'].lng for o in orders]),
+        pickup_lat=np.array([o['pickup'].lat for o in orders]),
+        dropoff_lng=np.array([o['dropoff'].lng for o in orders]),
+        dropoff_lat=np.array([o['dropoff'].lat for o in orders]),
+        volume=np.array([o['cargo_volume'] for o in orders]),
+        status=np.array([o['status'] for o in orders]),
+        status_id=np.array([STATUSES.index(o['status']) for o in orders], dtype=np.intp),
+    )
+
+@dataclass(frozen=True)
+class FreightStats:
+    """Aggregates over the hardcoded routes and orders, computed once"""
+    utilizations: np.ndarray
+    route_distances_km: np.ndarray
+    status_counts: dict
+    pending_orders: int
+    in_transit_orders: int
+    total_cargo_volume: float
+
+@lru_cache(maxsize=1)
+def get_freight_stats():
+    """Compute route utilization and order aggregates in a single pass over the arrays"""
+    ra = get_route_arrays()
+    oa = get_order_arrays()
+    statuses, first_seen, counts = np.unique(oa.status, return_index=True, return_counts=True)
+    order = np.argsort(first_seen)  # keep statuses in order of first appearance
+    status_counts = {str(statuses[i]): int(counts[i]) for i in order}
+    # Only a handful of routes: plain NumPy keeps Numba (and its JIT warm-up)
+    # off the statistics-only path
+    origin_lat, dest_lat = np.radians(ra.origin_lat), np.radians(ra.dest_lat)
+    dlng = np.radians(ra.dest_lng - ra.origin_lng)
+    a = (np.sin((dest_lat - origin_lat) / 2) ** 2
+         + np.cos(origin_lat) * np.cos(dest_lat) * np.sin(dlng / 2) ** 2)
+    return FreightStats(
+        utilizations=ra.load / ra.capacity * 100.0,
+        route_distances_km=2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0))),
+        status_counts=status_counts,
+        pending_orders=status_counts.get('pending', 0),
+        in_transit_orders=status_counts.get('in_transit', 0),
+        total_cargo_volume=float(oa.volume.sum()),
+    )
+
+def segments(x0, y0, x1, y1):
+    """Stack endpoint arrays into an (M, 2, 2) segment array for LineCollection"""
+    return np.stack([np.column_stack((x0, y0)), np.column_stack((x1, y1))], axis=1)
+
+@lru_cache(maxsize=1)
+def _osmnx():
+    """Import OSMNX and configure its response cache"""
+    import osmnx as ox
+    ox.settings.use_cache = True
+    ox.settings.cache_folder = str(GRAPH_CACHE_DIR)
+    return ox
+
+@lru_cache(maxsize=1)
+def _pyplot():
+    """Import pyplot once: Agg backend for headless runs, interactive mode otherwise"""
+    import matplotlib
+    if HEADLESS:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    if not HEADLESS:
+        plt.ion()
+    return plt
+
+def _load_cached_graph(cache_path, download):
+    """Return the pickled graph at cache_path, downloading and caching it on a miss"""
+    if cache_path.exists():
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+
+    G = download()
+
+    GRAPH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return G
+
+def _cache_key(*parts):
+    """Short stable digest used to name graph cache files"""
+    return hashlib.sha1(",".join(map(str, parts)).encode()).hexdigest()[:16]
+
+def load_road_network(locations, dist_m=ROAD_NETWORK_RADIUS_M, network_type='drive'):
+    """
+    Load the road network around each location, using the on-disk graph cache
+
+    Only a dist_m radius around every marker is downloaded (one cached graph
+    per point) instead of a padded bounding box over the whole state; the
+    per-point graphs are composed into one and the composite is cached too.
+    """
+    ox = _osmnx()
+    import networkx as nx
+
+    points = sorted((loc.id, round(loc.lat, 6), round(loc.lng, 6)) for loc in locations.values())
+    composite_path = GRAPH_CACHE_DIR / f"network_{_cache_key(points, dist_m, network_type)}.pkl"
+
+    def load_point(point):
+        loc_id, lat, lng = point
+        point_path = GRAPH_CACHE_DIR / f"point_{loc_id}_{_cache_key(lat, lng, dist_m, network_type)}.pkl"
+        print(f"Loading road network around location {loc_id}...")
+        return _load_cached_graph(
+            point_path,
+            lambda: ox.graph_from_point((lat, lng), dist=dist_m, network_type=network_type))
+
+    def download_composite():
+        # Per-point downloads are independent, so overlap their network waits
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS) as executor:
+            graphs = list(executor.map(load_point, points))
+        return nx.compose_all(graphs)
+
+    if composite_path.exists():
+        print(f"Loading cached road network: {composite_path}")
+    return _load_cached_graph(composite_path, download_composite)
+
+def get_road_segments(G, min_length_m=MIN_ROAD_EDGE_LENGTH_M):
+    """Simplify the road graph and return the polylines of edges at least min_length_m long"""
+    ox = _osmnx()
+    import shapely
+
+    if not G.graph.get('simplified'):
+        G = ox.simplify_graph(G)
+
+    edges = ox.graph_to_gdfs(G, nodes=False)
+    edges = edges[edges['length'] >= min_length_m]
+
+    coords, index = shapely.get_coordinates(edges.geometry.values, return_index=True)
+    split_at = np.flatnonzero(np.diff(index)) + 1
+    return np.split(coords, split_at) if len(coords) else []
 
-def setup_map_display():
-    """Setup matplotlib for interactive display with ESC key handler"""
-    plt.ion()  # Turn on interactive mode
+def get_map_cache_path(backend='matplotlib'):
+    """PNG cache path for the current locations, routes, orders and render settings"""
+    payload = {
+        'locations': sorted((name, loc.id, loc.lat, loc.lng, loc.marked)
+                            for name, loc in get_hardcoded_locations().items()),
+        'routes': [(r['id'], r['name'], r['origin'].id, r['destination'].id, r['color'],
+                    r['truck_capacity'], r['current_load']) for r in get_hardcoded_routes()],
+        'orders': [(o['id'], o['pickup'].id, o['dropoff'].id, o['cargo_volume'],
+                    o['cargo_type'].value, o['status']) for o in get_hardcoded_orders()],
+        'render': (backend, ROAD_NETWORK_RADIUS_M, MIN_ROAD_EDGE_LENGTH_M),
+    }
+    key = hashlib.blake2b(json.dumps(payload, sort_keys=True).encode(), digest_size=8).hexdigest()
+    return MAP_CACHE_DIR / f"map_{key}.png"
+
+def show_cached_map(cache_path):
+    """Display (or, headless, copy out) a previously rendered map PNG"""
+    if HEADLESS:
+        shutil.copyfile(cache_path, HEADLESS_MAP_PATH)
+        print(f"\n💾 Map saved to {HEADLESS_MAP_PATH}")
+        return
+    
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(16, 12), dpi=100)
+    fig.canvas.mpl_connect('key_press_event', _on_key_press)
+    ax.imshow(plt.imread(cache_path))
+    ax.set_axis_off()
+    plt.tight_layout()
+    plt.show()
+    print("\n⏳ Map is open - press ESC in the map window to close...")
+
+def _on_key_press(event):
+    """Close all map windows when ESC is pressed"""
+    if event.key == 'escape':
+        print("ESC pressed - closing map...")
+        _pyplot().close('all')
+
+def draw_matplotlib_layers(ax, road_segments, city_coords, stop_coords, ra, oa):
+    """Draw roads, locations, routes and orders as batched Matplotlib artists"""
+    from matplotlib.collections import LineCollection
     
-    def on_key_press(event):
-        """Handle key press events"""
-        if event.key == 'escape':
-            print("ESC pressed - closing map...")
-            plt.close('all')
-            plt.ioff()
+    # Road network as one collection; rasterized so redraws composite one
+    # bitmap instead of stroking every road
+    ax.add_collection(LineCollection(road_segments, linewidths=0.3,
+                                     colors='lightgray', zorder=1, rasterized=True))
+    ax.autoscale_view()
     
-    return on_key_press
+    # Major cities and pickup/dropoff locations, one scatter each
+    ax.scatter(city_coords[:, 1], city_coords[:, 0], c='red', s=150,
+              zorder=10, marker='s', edgecolors='darkred', linewidths=2)
+    ax.scatter(stop_coords[:, 1], stop_coords[:, 0], c='orange', s=80,
+              zorder=8, marker='o', edgecolors='darkorange', linewidths=1)
+    
+    # All route lines as a single collection of (origin, destination) segments
+    route_segments = segments(ra.origin_lng, ra.origin_lat, ra.dest_lng, ra.dest_lat)
+    ax.add_collection(LineCollection(route_segments, colors=ra.color,
+                                     linewidths=4, alpha=0.7, zorder=5))
+    
+    # All order lines as a single dashed collection, colored by status id
+    order_segments = segments(oa.pickup_lng, oa.pickup_lat, oa.dropoff_lng, oa.dropoff_lat)
+    ax.add_collection(LineCollection(order_segments, colors=STATUS_COLORS[oa.status_id],
+                                     linewidths=2, linestyles='--', alpha=0.6, zorder=3))
+    
+    # Pickup and dropoff markers, one scatter per status group
+    for status_id, marker in enumerate(STATUS_MARKERS):
+        mask = oa.status_id == status_id
+        if not mask.any():
+            continue
+        stop_lngs = np.concatenate((oa.pickup_lng[mask], oa.dropoff_lng[mask]))
+        stop_lats = np.concatenate((oa.pickup_lat[mask], oa.dropoff_lat[mask]))
+        ax.scatter(stop_lngs, stop_lats,
+                  c=STATUS_COLORS[status_id], s=100, marker=marker,
+                  zorder=7, edgecolors='black', linewidths=1)
 
-def create_osmnx_map():
-    """Create and display OSMNX map with hardcoded data"""
+def draw_datashader_layers(ax, road_segments, city_coords, stop_coords, ra, oa,
+                           plot_width=1600, plot_height=1200, padding_deg=0.1):
+    """
+    Rasterize roads, locations, routes and orders with datashader and show the
+    result as a single image, so render cost scales with pixels, not features
+    """
+    import datashader as ds
+    import datashader.transfer_functions as tf
+    import pandas as pd
+    
+    all_coords = np.vstack((city_coords, stop_coords))
+    south, west = all_coords.min(axis=0) - padding_deg
+    north, east = all_coords.max(axis=0) + padding_deg
+    cvs = ds.Canvas(plot_width=plot_width, plot_height=plot_height,
+                    x_range=(west, east), y_range=(south, north))
+    
+    def line_frame(lng0, lat0, lng1, lat1, category):
+        return pd.DataFrame({'lng0': lng0, 'lat0': lat0, 'lng1': lng1, 'lat1': lat1,
+                             'category': pd.Categorical(category)})
+    
+    layers = []
+    
+    # Road polylines flattened into one NaN-separated path
+    if len(road_segments):
+        breaks = np.full((1, 2), np.nan)
+        road_path = np.vstack([part for seg in road_segments for part in (seg, breaks)])
+        roads = pd.DataFrame({'lng': road_path[:, 0], 'lat': road_path[:, 1]})
+        layers.append(tf.shade(cvs.line(roads, 'lng', 'lat'), cmap=['lightgray', 'gray']))
+    
+    # Order and route segments, colored by status and route color categories
+    orders_df = line_frame(oa.pickup_lng, oa.pickup_lat, oa.dropoff_lng, oa.dropoff_lat,
+                           STATUS_COLORS[oa.status_id])
+    layers.append(tf.shade(cvs.line(orders_df, x=['lng0', 'lng1'], y=['lat0', 'lat1'], axis=1,
+                                    agg=ds.count_cat('category')),
+                           color_key={c: c for c in orders_df['category'].cat.categories}))
+    routes_df = line_frame(ra.origin_lng, ra.origin_lat, ra.dest_lng, ra.dest_lat, ra.color)
+    layers.append(tf.spread(tf.shade(cvs.line(routes_df, x=['lng0', 'lng1'], y=['lat0', 'lat1'],
+                                              axis=1, agg=ds.count_cat('category')),
+                                     color_key={c: c for c in routes_df['category'].cat.categories}),
+                            px=1))
+    
+    # Location points
+    points = pd.DataFrame({
+        'lng': np.concatenate((city_coords[:, 1], stop_coords[:, 1])),
+        'lat': np.concatenate((city_coords[:, 0], stop_coords[:, 0])),
+        'category': pd.Categorical(['red'] * len(city_coords) + ['orange'] * len(stop_coords)),
+    })
+    layers.append(tf.spread(tf.shade(cvs.points(points, 'lng', 'lat', agg=ds.count_cat('category')),
+                                     color_key={'red': 'red', 'orange': 'orange'}), px=4))
+    
+    img = tf.stack(*layers)
+    ax.imshow(img.to_pil(), extent=(west, east, south, north), origin='upper',
+              aspect='auto', zorder=1)
+
+def create_osmnx_map(use_cache=True, backend='matplotlib'):
+    """
+    Create and display OSMNX map with hardcoded data
+
+    When use_cache is set and the data is unchanged since the last render,
+    the cached PNG is shown instead of rebuilding the map. backend selects
+    'matplotlib' (vector artists) or 'datashader' (rasterized layers, for
+    networks too large to draw artist by artist; labels stay matplotlib).
+    """
+    plt = _pyplot()
+    from matplotlib.collections import EllipseCollection
+    
     print("🗺️  Creating OSMNX Map with Hardcoded Data")
     print("=" * 50)
     
@@ -142,124 +478,79 @@ def create_osmnx_map():
     routes = get_hardcoded_routes()
     orders = get_hardcoded_orders()
     
-    # Calculate map bounds
-    all_lats = [loc.lat for loc in locations.values()]
-    all_lngs = [loc.lng for loc in locations.values()]
-    
-    north = max(all_lats) + 0.3
-    south = min(all_lats) - 0.3
-    east = max(all_lngs) + 0.3
-    west = min(all_lngs) - 0.3
+    # Calculate tight map bounds with vectorized min/max over the (lat, lng) array
+    coords = get_location_coords(locations)
+    south, west = coords.min(axis=0)
+    north, east = coords.max(axis=0)
     
     print(f"Map bounds: {south:.2f}°S to {north:.2f}°N, {west:.2f}°W to {east:.2f}°E")
     
     try:
-        # Download road network
-        print("Downloading road network...")
-        G = ox.graph_from_bbox(north, south, east, west, network_type='drive')
-        print(f"Network loaded: {len(G.nodes)} nodes, {len(G.edges)} edges")
-        
-        # Setup interactive display
-        key_handler = setup_map_display()
+        cache_path = get_map_cache_path(backend)
+        if use_cache and cache_path.exists():
+            print(f"Using cached map render: {cache_path}")
+            show_cached_map(cache_path)
+            return True
         
-        # Create figure
-        fig, ax = plt.subplots(figsize=(16, 12))
-        fig.canvas.mpl_connect('key_press_event', key_handler)
+        # Load road network around each location (downloaded on first run, then cached on disk)
+        G = load_road_network(locations, network_type='drive')
+        print(f"Network loaded: {len(G.nodes)} nodes, {len(G.edges)} edges")
         
-        # Plot road network
-        ox.plot_graph(G, ax=ax, node_size=0, edge_linewidth=0.3, 
-                     edge_color='lightgray', show=False, close=False)
+        # Create figure, wiring up interactive display unless headless
+        fig, ax = plt.subplots(figsize=(16, 12), dpi=100)
+        if not HEADLESS:
+            fig.canvas.mpl_connect('key_press_event', _on_key_press)
         
-        # Plot major city locations (marked=True)
+        # Plot road network, locations, routes and orders
+        road_segments = get_road_segments(G)
+        print(f"Drawing {len(road_segments)} road segments ({backend} backend)")
         major_cities = {name: loc for name, loc in locations.items() if loc.marked}
+        pickup_dropoff = {name: loc for name, loc in locations.items() if not loc.marked}
+        city_coords = get_location_coords(major_cities)
+        stop_coords = get_location_coords(pickup_dropoff)
+        ra = get_route_arrays()
+        oa = get_order_arrays()
+        if backend == 'datashader':
+            draw_datashader_layers(ax, road_segments, city_coords, stop_coords, ra, oa)
+        else:
+            draw_matplotlib_layers(ax, road_segments, city_coords, stop_coords, ra, oa)
+        
+        # Labels are always drawn with matplotlib
         for name, location in major_cities.items():
-            ax.scatter(location.lng, location.lat, c='red', s=150, 
-                      zorder=10, marker='s', edgecolors='darkred', linewidths=2)
             ax.annotate(name.replace('_', ' ').title(), 
                        (location.lng, location.lat),
                        xytext=(8, 8), textcoords='offset points',
-                       fontsize=11, fontweight='bold',
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor='white', 
-                               edgecolor='darkred', alpha=0.9))
-        
-        # Plot pickup/dropoff locations (marked=False)
-        pickup_dropoff = {name: loc for name, loc in locations.items() if not loc.marked}
+                       fontsize=11, fontweight='bold', bbox=CITY_LABEL_BBOX)
         for name, location in pickup_dropoff.items():
-            ax.scatter(location.lng, location.lat, c='orange', s=80, 
-                      zorder=8, marker='o', edgecolors='darkorange', linewidths=1)
             ax.annotate(name.replace('_', ' ').title(), 
                        (location.lng, location.lat),
                        xytext=(5, 5), textcoords='offset points',
-                       fontsize=9, style='italic',
-                       bbox=dict(boxstyle='round,pad=0.2', facecolor='lightyellow', 
-                               edgecolor='orange', alpha=0.8))
+                       fontsize=9, style='italic', bbox=STOP_LABEL_BBOX)
         
-        # Plot routes
-        for route in routes:
-            origin = route['origin']
-            dest = route['destination']
-            
-            # Draw route line
-            ax.plot([origin.lng, dest.lng], [origin.lat, dest.lat],
-                   color=route['color'], linewidth=4, alpha=0.7, zorder=5)
-            
-            # Calculate utilization
-            utilization = (route['current_load'] / route['truck_capacity']) * 100
-            
-            # Add route info
-            mid_lng = (origin.lng + dest.lng) / 2
-            mid_lat = (origin.lat + dest.lat) / 2
-            
-            route_text = f"{route['name']}\n{utilization:.1f}% Full"
+        # Route info labels from precomputed utilization and vectorized midpoints
+        stats = get_freight_stats()
+        mid_lngs = 0.5 * (ra.origin_lng + ra.dest_lng)
+        mid_lats = 0.5 * (ra.origin_lat + ra.dest_lat)
+        for name, color, utilization, mid_lng, mid_lat in zip(
+                ra.names, ra.color, stats.utilizations, mid_lngs, mid_lats):
+            route_text = f"{name}\n{utilization:.1f}% Full"
             ax.annotate(route_text, (mid_lng, mid_lat),
                        fontsize=10, ha='center', va='center',
                        bbox=dict(boxstyle='round,pad=0.3', 
-                               facecolor=route['color'], alpha=0.3,
-                               edgecolor=route['color']))
-        
-        # Plot orders with different markers based on status
-        status_colors = {
-            'pending': 'yellow',
-            'assigned': 'lightblue', 
-            'in_transit': 'lightgreen'
-        }
+                               facecolor=color, alpha=0.3,
+                               edgecolor=color))
         
-        status_markers = {
-            'pending': '^',
-            'assigned': 'D',
-            'in_transit': 'v'
-        }
-        
-        for order in orders:
-            pickup = order['pickup']
-            dropoff = order['dropoff']
-            status = order['status']
-            
-            # Draw order line
-            ax.plot([pickup.lng, dropoff.lng], [pickup.lat, dropoff.lat],
-                   color=status_colors[status], linewidth=2, linestyle='--', 
-                   alpha=0.6, zorder=3)
-            
-            # Pickup marker
-            ax.scatter(pickup.lng, pickup.lat, 
-                      c=status_colors[status], s=100,
-                      marker=status_markers[status], 
-                      zorder=7, edgecolors='black', linewidths=1)
-            
-            # Dropoff marker  
-            ax.scatter(dropoff.lng, dropoff.lat,
-                      c=status_colors[status], s=100,
-                      marker=status_markers[status],
-                      zorder=7, edgecolors='black', linewidths=1)
-        
-        # Add proximity circles (1km radius) around major cities
-        for name, location in major_cities.items():
-            # Convert 1km to degrees (approximate)
-            km_to_deg = 1.0 / 111.0  # Rough conversion
-            circle = Circle((location.lng, location.lat), km_to_deg,
-                           fill=False, color='red', linestyle=':', 
-                           alpha=0.5, linewidth=2, zorder=2)
-            ax.add_patch(circle)
+        # Add proximity circles (1km radius) around major cities in one collection
+        # 1km is 1/111 degree of latitude, but longitude degrees shrink with cos(lat)
+        km_to_deg_lat = 1.0 / 111.0
+        zone_widths = 2 * km_to_deg_lat / np.cos(np.radians(city_coords[:, 0]))
+        zone_heights = np.full_like(zone_widths, 2 * km_to_deg_lat)
+        proximity_zones = EllipseCollection(
+            zone_widths, zone_heights, np.zeros(len(city_coords)),
+            units='xy', offsets=city_coords[:, ::-1], offset_transform=ax.transData,
+            facecolors='none', edgecolors='red', linestyles=':',
+            alpha=0.5, linewidths=2, zorder=2)
+        ax.add_collection(proximity_zones)
         
         # Create legend
         legend_elements = [
@@ -294,9 +585,9 @@ def create_osmnx_map():
         stats_text = f"""Network Statistics:
 • Total Locations: {len(locations)}
 • Active Routes: {len(routes)}
-• Pending Orders: {len([o for o in orders if o['status'] == 'pending'])}
-• Routes in Transit: {len([o for o in orders if o['status'] == 'in_transit'])}
-• Total Cargo Volume: {sum(o['cargo_volume'] for o in orders):.1f} m³"""
+• Pending Orders: {stats.pending_orders}
+• Routes in Transit: {stats.in_transit_orders}
+• Total Cargo Volume: {stats.total_cargo_volume:.1f} m³"""
         
         ax.text(0.98, 0.02, stats_text, transform=ax.transAxes,
                fontsize=10, verticalalignment='bottom', horizontalalignment='right',
@@ -310,6 +601,16 @@ def create_osmnx_map():
         print(f"   • {len(pickup_dropoff)} pickup/dropoff locations")
         print(f"   • {len(routes)} active routes")
         print(f"   • {len(orders)} freight orders")
+        
+        MAP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fig.savefig(cache_path, dpi=120)
+        
+        if HEADLESS:
+            fig.savefig(HEADLESS_MAP_PATH, dpi=100)
+            plt.close(fig)
+            print(f"\n💾 Map saved to {HEADLESS_MAP_PATH}")
+            return True
+        
         print("\n🎮 Controls:")
         print("   • Press ESC to close the map")
         print("   • Use mouse to pan and zoom")
@@ -340,25 +641,21 @@ def main():
     print(f"   Routes: {len(routes)} active freight routes")
     print(f"   Orders: {len(orders)} freight orders")
     
+    stats = get_freight_stats()
+    
     # Show route utilization
     print(f"\n🚛 Route Utilization:")
-    for route in routes:
-        utilization = (route['current_load'] / route['truck_capacity']) * 100
+    for route, utilization, distance_km in zip(routes, stats.utilizations, stats.route_distances_km):
         status = "🔴 High" if utilization > 80 else "🟡 Medium" if utilization > 50 else "🟢 Low"
-        print(f"   {route['name']}: {utilization:.1f}% {status}")
+        print(f"   {route['name']}: {utilization:.1f}% {status} ({distance_km:.0f} km)")
     
     # Show order distribution
-    order_status_count = {}
-    for order in orders:
-        status = order['status']
-        order_status_count[status] = order_status_count.get(status, 0) + 1
-    
     print(f"\n📦 Order Status Distribution:")
-    for status, count in order_status_count.items():
+    for status, count in stats.status_counts.items():
         print(f"   {status.title()}: {count} orders")
     
     # Create and display map
-    success = create_osmnx_map()
+    success = create_osmnx_map(backend=os.environ.get('DFM_MAP_BACKEND', 'matplotlib'))
     
     if success:
         print("\n✅ OSMNX Test completed successfully!")
@@ -12,27 +12,37 @@ Requirements addressed:
 """
 
 import time
+import math
+import asyncio
+import random
+import multiprocessing
+from multiprocessing.sharedctypes import RawValue
 import psutil
 import gc
 import threading
 import statistics
-from typing import Dict, List, Optional, Callable, Any, Tuple
+from typing import Deque, Dict, List, Optional, Callable, Any, Tuple
+from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
-from order_processor import OrderProcessor
+import numpy as np
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import tracemalloc
+from array import array
 import sys
 import os
+from order_processor import OrderProcessor
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import Order, Route, Truck
+from utils.geom import njit
 
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Detailed performance metrics for a single operation"""
     operation_name: str
@@ -45,7 +55,7 @@ class PerformanceMetrics:
     additional_data: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadTestResults:
     """Results from load testing operations"""
     test_name: str
@@ -61,24 +71,38 @@ class LoadTestResults:
     memory_peak_mb: float
     cpu_peak_percent: float
     error_rate_percent: float
+    percentile_50_ms: float = 0.0
+    percentile_99_ms: float = 0.0
     errors: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryReport:
     """Memory usage monitoring report"""
     process_id: int
     peak_memory_mb: float
     current_memory_mb: float
     memory_growth_mb: float
-    gc_collections: Dict[str, int]
+    gc_collections: Dict[int, int]  # generation -> change in gc.get_count()
     potential_leaks: List[str]
     monitoring_duration_seconds: float
     samples_count: int
-    memory_timeline: List[Tuple[datetime, float]] = field(default_factory=list)
-
-
-@dataclass
+    # Raw samples: seconds since start_time and RSS in MB
+    sample_offsets: array = field(default_factory=lambda: array('d'))
+    sample_rss_mb: array = field(default_factory=lambda: array('d'))
+    start_time: datetime = field(default_factory=datetime.now)
+
+    @property
+    def memory_timeline(self) -> List[Tuple[datetime, float]]:
+        """(timestamp, RSS MB) pairs, built from the raw samples on access"""
+        start_time = self.start_time
+        return [
+            (start_time + timedelta(seconds=offset), rss)
+            for offset, rss in zip(self.sample_offsets, self.sample_rss_mb)
+        ]
+
+
+@dataclass(slots=True)
 class BenchmarkResults:
     """Benchmark comparison results"""
     benchmark_name: str
@@ -91,6 +115,183 @@ class BenchmarkResults:
     recommendations: List[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True, slots=True)
+class FleetHandle:
+    """Routes and trucks with their processing arrays built once, see prepare_fleet"""
+    routes: List[Route]
+    trucks: List[Truck]
+    route_points: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+
+@dataclass(frozen=True, slots=True)
+class ResourcePeaks:
+    """
+    Peak memory (MB) and CPU (%) seen by a resource monitor, see _start_resource_monitor
+
+    A caller that wants a peak per interval starts an epoch with new_epoch();
+    the monitor restarts the memory peak at its next sample and tags it with
+    that epoch, and memory_peak_since() only returns a peak tagged with the
+    caller's epoch. The monitor is the only writer of memory, cpu and
+    memory_epoch and the caller the only writer of epoch, so the plain shared
+    values need no lock.
+    """
+    memory: Any = field(default_factory=lambda: RawValue('d', 0.0))
+    cpu: Any = field(default_factory=lambda: RawValue('d', 0.0))
+    epoch: Any = field(default_factory=lambda: RawValue('L', 0))
+    memory_epoch: Any = field(default_factory=lambda: RawValue('L', 0))
+
+    def new_epoch(self) -> int:
+        """Start a new peak interval (caller side) and return its epoch"""
+        self.epoch.value += 1
+        return self.epoch.value
+
+    def memory_peak_since(self, epoch: int) -> Optional[float]:
+        """Peak memory sampled since new_epoch() returned epoch, or None if no sample yet"""
+        if self.memory_epoch.value != epoch:
+            return None
+        return self.memory.value
+
+    def record(self, epoch: int, memory_mb: float, cpu_percent: float):
+        """Fold one sample, taken after epoch was read, into the peaks (monitor side)"""
+        if self.memory_epoch.value != epoch:
+            self.memory.value = memory_mb
+            self.memory_epoch.value = epoch
+        elif memory_mb > self.memory.value:
+            self.memory.value = memory_mb
+        if cpu_percent > self.cpu.value:
+            self.cpu.value = cpu_percent
+
+
+# Load-test error messages kept per worker and per report
+MAX_REPORTED_ERRORS = 100
+
+
+@njit(cache=True)
+def _reduce_stats(arr):
+    """
+    Single-pass reduction over response times where NaN marks failures
+
+    Returns:
+        Tuple of (valid count, sum, min, max, compacted valid values)
+    """
+    valid = np.empty_like(arr)
+    count = 0
+    total = 0.0
+    mn = np.inf
+    mx = -np.inf
+    for i in range(arr.shape[0]):
+        value = arr[i]
+        if value == value:  # False only for NaN
+            valid[count] = value
+            count += 1
+            total += value
+            if value < mn:
+                mn = value
+            if value > mx:
+                mx = value
+    return count, total, mn, mx, valid[:count]
+
+
+def _execute_load_test_ops(order_processor: OrderProcessor, order_generator: Callable[[], Order],
+                           route: Optional[Route], truck: Optional[Truck], worker_id: int,
+                           operations: int) -> Tuple[int, int, List[float], List[str]]:
+    """
+    Run one load-test worker's operations
+
+    Counts and timings are kept local to the worker and returned for
+    aggregation, so no state is shared between workers.
+
+    Returns:
+        Tuple of (successes, failures, elapsed nanoseconds per operation, errors);
+        failed operations are recorded as NaN and at most MAX_REPORTED_ERRORS
+        error messages are kept
+    """
+    successes = 0
+    failures = 0
+    response_times = [math.nan] * operations
+    errors = []
+    perf_counter_ns = time.perf_counter_ns
+    validate = order_processor.validate_order_for_route
+
+    def record_error(op_num: int, e: Exception):
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(f"Worker {worker_id}, Op {op_num}: {str(e)}")
+
+    # Generate all test orders up front so only validation is timed
+    orders: List[Optional[Order]] = [None] * operations
+    for op_num in range(operations):
+        try:
+            orders[op_num] = order_generator()
+        except Exception as e:
+            record_error(op_num, e)
+
+    for op_num, order in enumerate(orders):
+        if order is None:
+            failures += 1
+            continue
+
+        try:
+            # Time the operation
+            start_ns = perf_counter_ns()
+
+            # Process single order
+            result = validate(order, route, truck)
+
+            response_times[op_num] = perf_counter_ns() - start_ns
+
+            if result.is_valid:
+                successes += 1
+            else:
+                failures += 1
+
+        except Exception as e:
+            failures += 1
+            record_error(op_num, e)
+
+    return successes, failures, response_times, errors
+
+
+# Per-process state for load-test pool workers, set once by the initializer
+_load_test_worker_state: Optional[Tuple[OrderProcessor, Callable[[], Order],
+                                        Optional[Route], Optional[Truck]]] = None
+
+
+def _init_load_test_worker(order_processor: OrderProcessor, order_generator: Callable[[], Order],
+                           route: Optional[Route], truck: Optional[Truck]):
+    """Pool initializer: keep the shared test inputs in this worker's globals"""
+    global _load_test_worker_state
+    _load_test_worker_state = (order_processor, order_generator, route, truck)
+
+
+def _run_load_test_ops(args: Tuple[int, int, int]) -> Tuple[int, int, List[float], List[str]]:
+    """Pool task: run one worker's operations with its own random seed"""
+    worker_id, operations, seed = args
+    # Forked workers inherit the parent's random state; reseed so they differ
+    random.seed(seed)
+    return _execute_load_test_ops(*_load_test_worker_state, worker_id, operations)
+
+
+def _load_test_pool_context() -> Optional[multiprocessing.context.BaseContext]:
+    """
+    Multiprocessing context for load-test workers
+
+    Fork lets workers inherit unpicklable order generators (lambdas, closures);
+    None means fork is unavailable and threads should be used instead.
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+# Benchmark recommendation messages, indexed by the bit set in run_benchmarks
+_BENCHMARK_RECOMMENDATIONS: Tuple[Callable[[PerformanceMetrics, Optional[float]], str], ...] = (
+    lambda m, change: f"Execution time {m.execution_time_ms:.1f}ms exceeds 5-second limit",
+    lambda m, change: f"Performance regression detected: {change:.1f}% slower",
+    lambda m, change: f"High memory usage: {m.memory_usage_mb:.1f}MB",
+    lambda m, change: f"Test failed: {m.error_message}",
+)
+
+
 class PerformanceAssessor:
     """
     Comprehensive performance assessment and monitoring system
@@ -99,21 +300,62 @@ class PerformanceAssessor:
     capabilities for the Digital Freight Matching system.
     """
 
-    def __init__(self):
-        """Initialize the performance assessor"""
+    def __init__(self, max_history: int = 10_000):
+        """
+        Initialize the performance assessor
+
+        Args:
+            max_history: Number of most recent metrics kept in performance_history
+        """
         self.order_processor = OrderProcessor()
         self.baseline_metrics: Dict[str, PerformanceMetrics] = {}
-        self.performance_history: List[PerformanceMetrics] = []
+        self.performance_history: Deque[PerformanceMetrics] = deque(maxlen=max_history)
+        # Column copies of the history fields the report reduces over; they may
+        # hold older entries than the history, aligned at the newest end
+        self._last_recorded: Optional[PerformanceMetrics] = None
+        self._exec_ms = array('d')
+        self._mem_mb = array('d')
+        self._success = array('b')
         self.memory_monitor_active = False
         self.memory_samples: List[Tuple[datetime, float]] = []
+        # One process handle reused by every measurement
+        self._proc = psutil.Process(os.getpid())
+        self.resource_sample_interval_seconds = 0.5
 
         # Performance thresholds from requirements
         self.max_order_processing_time_ms = 5000  # 5 seconds per order
         self.max_acceptable_error_rate = 5.0  # 5% error rate
         self.memory_leak_threshold_mb = 100  # 100MB growth indicates potential leak
+        self.leak_snapshot_step_mb = 10  # RSS change that triggers an allocation snapshot
+        self.leak_reclaim_probability_threshold = 0.5  # sites less likely than this to be freed are leaks
+
+    @property
+    def _process(self) -> psutil.Process:
+        """Cached psutil handle for the current process, refreshed after a fork"""
+        pid = os.getpid()
+        if self._proc.pid != pid:
+            self._proc = psutil.Process(pid)
+        return self._proc
+
+    def prepare_fleet(self, routes: List[Route], trucks: List[Truck]) -> FleetHandle:
+        """
+        Build the per-fleet processing arrays once for repeated profiling
 
-    def profile_order_processing(self, orders: List[Order], routes: List[Route],
-                               trucks: List[Truck]) -> PerformanceMetrics:
+        Args:
+            routes: Available routes
+            trucks: Available trucks
+
+        Returns:
+            FleetHandle to pass as fleet= to the profiling methods
+        """
+        route_points = None
+        if routes and trucks:
+            route_points = self.order_processor.route_point_arrays(routes[:len(trucks)])
+        return FleetHandle(routes=routes, trucks=trucks, route_points=route_points)
+
+    def profile_order_processing(self, orders: List[Order], routes: Optional[List[Route]] = None,
+                               trucks: Optional[List[Truck]] = None,
+                               fleet: Optional[FleetHandle] = None) -> PerformanceMetrics:
         """
         Profile order processing execution time and resource usage
 
@@ -121,30 +363,82 @@ class PerformanceAssessor:
             orders: List of orders to process
             routes: Available routes
             trucks: Available trucks
+            fleet: Prepared fleet, used instead of routes and trucks
 
         Returns:
             PerformanceMetrics with detailed performance data
         """
+        return self.profile_order_processing_batched([orders], routes, trucks, fleet=fleet)[0]
+
+    def profile_order_processing_batched(self, order_slices: List[List[Order]],
+                                         routes: Optional[List[Route]] = None,
+                                         trucks: Optional[List[Truck]] = None,
+                                         fleet: Optional[FleetHandle] = None) -> List[PerformanceMetrics]:
+        """
+        Profile several order batches in one monitoring session
+
+        The resource monitor is started once for all slices; each slice gets
+        its own timing, CPU and memory fences, so the metrics match what
+        profile_order_processing would report for it alone.
+
+        Args:
+            order_slices: Order lists to process, one batch each
+            routes: Available routes
+            trucks: Available trucks
+            fleet: Prepared fleet, used instead of routes and trucks
+
+        Returns:
+            One PerformanceMetrics per slice, in order
+        """
+        if fleet is None:
+            fleet = self.prepare_fleet(routes, trucks)
+        process = self._process
+        # Slice memory is this process's RSS, so the monitor leaves children out
+        stop_monitor, monitor_thread, peaks = self._start_resource_monitor(include_children=False)
+
+        metrics_list = []
+        try:
+            for orders in order_slices:
+                metrics_list.append(self._profile_order_slice(process, orders, fleet, peaks))
+        finally:
+            stop_monitor.set()
+            monitor_thread.join()
+
+        # Store in history
+        for metrics in metrics_list:
+            self._record_metrics(metrics)
+
+        return metrics_list
+
+    def _profile_order_slice(self, process: psutil.Process, orders: List[Order], fleet: FleetHandle,
+                             peaks: ResourcePeaks) -> PerformanceMetrics:
+        """Profile one order batch while the resource monitor is running"""
         operation_name = f"order_processing_{len(orders)}_orders"
 
-        # Start memory and CPU monitoring
-        process = psutil.Process()
         initial_memory = process.memory_info().rss / 1024 / 1024  # MB
+        # The monitor restarts its peak for this slice at its next sample
+        epoch = peaks.new_epoch()
 
         # Start execution timing
-        start_time = time.perf_counter()
+        start_ns = time.perf_counter_ns()
         start_cpu_times = process.cpu_times()
 
         success = True
         error_message = None
         additional_data = {}
+        results = None
 
         try:
             # Process orders using the order processor
-            results = self.order_processor.process_order_batch(orders, routes, trucks)
-
-            # Calculate success metrics
-            successful_orders = sum(1 for result in results.values() if result.is_valid)
+            results = self.order_processor.process_order_batch(orders, fleet.routes, fleet.trucks,
+                                                               route_points=fleet.route_points)
+
+            # Calculate success metrics in a single pass over the results
+            successful_orders = 0
+            validation_errors = 0
+            for result in results.values():
+                successful_orders += result.is_valid
+                validation_errors += len(result.errors)
             total_orders = len(orders)
             success_rate = (successful_orders / total_orders * 100) if total_orders > 0 else 0
 
@@ -152,7 +446,7 @@ class PerformanceAssessor:
                 'total_orders': total_orders,
                 'successful_orders': successful_orders,
                 'success_rate_percent': success_rate,
-                'validation_errors': sum(len(result.errors) for result in results.values())
+                'validation_errors': validation_errors
             }
 
         except Exception as e:
@@ -161,20 +455,31 @@ class PerformanceAssessor:
             additional_data['exception_type'] = type(e).__name__
 
         # Calculate execution time
-        end_time = time.perf_counter()
-        execution_time_ms = (end_time - start_time) * 1000
+        end_ns = time.perf_counter_ns()
+        end_cpu_times = process.cpu_times()
+        execution_time_ms = (end_ns - start_ns) / 1e6
+
+        # Release the batch results before the final reading, so memory that
+        # stays allocated (potential leak) is told apart from transient results
+        pre_release_memory = process.memory_info().rss / 1024 / 1024  # MB
+        monitor_peak = peaks.memory_peak_since(epoch)
+        additional_data['peak_memory_mb'] = max(initial_memory, pre_release_memory,
+                                                monitor_peak if monitor_peak is not None else 0.0)
+        del results
+        gc.collect(0)
+        final_memory = process.memory_info().rss / 1024 / 1024  # MB
+        additional_data['pre_release_memory_mb'] = pre_release_memory
+        additional_data['post_release_memory_mb'] = final_memory
 
         # Calculate memory usage
-        final_memory = process.memory_info().rss / 1024 / 1024  # MB
         memory_usage_mb = final_memory - initial_memory
 
         # Calculate CPU usage (approximate)
-        end_cpu_times = process.cpu_times()
         cpu_time_used = (end_cpu_times.user - start_cpu_times.user) + (end_cpu_times.system - start_cpu_times.system)
-        wall_time = end_time - start_time
+        wall_time = (end_ns - start_ns) / 1e9
         cpu_usage_percent = (cpu_time_used / wall_time * 100) if wall_time > 0 else 0
 
-        metrics = PerformanceMetrics(
+        return PerformanceMetrics(
             operation_name=operation_name,
             execution_time_ms=execution_time_ms,
             memory_usage_mb=memory_usage_mb,
@@ -184,11 +489,6 @@ class PerformanceAssessor:
             additional_data=additional_data
         )
 
-        # Store in history
-        self.performance_history.append(metrics)
-
-        return metrics
-
     def run_load_tests(self, order_generator: Callable[[], Order], routes: List[Route],
                       trucks: List[Truck], concurrent_users: int = 10,
                       operations_per_user: int = 100) -> LoadTestResults:
@@ -199,8 +499,9 @@ class PerformanceAssessor:
             order_generator: Function that generates test orders
             routes: Available routes
             trucks: Available trucks
-            concurrent_users: Number of concurrent threads
-            operations_per_user: Operations per thread
+            concurrent_users: Number of concurrent worker processes (threads
+                where fork is unavailable)
+            operations_per_user: Operations per worker
 
         Returns:
             LoadTestResults with comprehensive load test metrics
@@ -214,90 +515,143 @@ class PerformanceAssessor:
         successful_operations = 0
         failed_operations = 0
 
-        # Memory and CPU monitoring
-        process = psutil.Process()
-        initial_memory = process.memory_info().rss / 1024 / 1024
-        peak_memory = initial_memory
-        peak_cpu = 0.0
-
-        def worker_thread(thread_id: int) -> List[float]:
-            """Worker thread for load testing"""
-            thread_response_times = []
+        route = routes[0] if routes else None
+        truck = trucks[0] if trucks else None
 
-            for op_num in range(operations_per_user):
-                try:
-                    # Generate test order
-                    order = order_generator()
+        def collect(result: Tuple[int, int, List[float], List[str]]):
+            nonlocal successful_operations, failed_operations
+            successes, failures, worker_times, worker_errors = result
+            successful_operations += successes
+            failed_operations += failures
+            response_times.extend(worker_times)
+            errors.extend(worker_errors[:MAX_REPORTED_ERRORS - len(errors)])
 
-                    # Time the operation
-                    start_time = time.perf_counter()
+        pool_context = _load_test_pool_context()
 
-                    # Process single order
-                    result = self.order_processor.validate_order_for_route(
-                        order, routes[0] if routes else None, trucks[0] if trucks else None
-                    )
+        if pool_context is not None:
+            # Order validation is CPU-bound, so each user gets its own process
+            with pool_context.Pool(processes=concurrent_users, initializer=_init_load_test_worker,
+                                   initargs=(self.order_processor, order_generator, route, truck)) as pool:
+                # Memory and CPU are sampled by a background monitor, off the timed path
+                stop_monitor, monitor_thread, peaks = self._start_resource_monitor()
+                start_ns = time.perf_counter_ns()
 
-                    end_time = time.perf_counter()
-                    response_time_ms = (end_time - start_time) * 1000
-                    thread_response_times.append(response_time_ms)
+                tasks = [(i, operations_per_user, random.getrandbits(32)) for i in range(concurrent_users)]
+                try:
+                    for result in pool.imap_unordered(_run_load_test_ops, tasks, chunksize=1):
+                        collect(result)
+                except Exception as e:
+                    errors.append(f"Worker execution error: {str(e)}")
+        else:
+            stop_monitor, monitor_thread, peaks = self._start_resource_monitor()
+            start_ns = time.perf_counter_ns()
+
+            with ThreadPoolExecutor(max_workers=concurrent_users) as executor:
+                futures = [
+                    executor.submit(_execute_load_test_ops, self.order_processor, order_generator,
+                                    route, truck, i, operations_per_user)
+                    for i in range(concurrent_users)
+                ]
+
+                # Collect results
+                for future in as_completed(futures):
+                    try:
+                        collect(future.result())
+                    except Exception as e:
+                        errors.append(f"Thread execution error: {str(e)}")
+
+        total_duration = (time.perf_counter_ns() - start_ns) / 1e9
+
+        stop_monitor.set()
+        monitor_thread.join()
+
+        return self._build_load_test_results(
+            test_name, total_operations, successful_operations, failed_operations,
+            response_times, errors, total_duration, peaks.memory.value, peaks.cpu.value
+        )
 
-                    if result.is_valid:
-                        nonlocal successful_operations
-                        successful_operations += 1
-                    else:
-                        nonlocal failed_operations
-                        failed_operations += 1
+    async def run_load_tests_async(self, order_generator: Callable[[], Order], routes: List[Route],
+                                   trucks: List[Truck], concurrent_users: int = 10,
+                                   operations_per_user: int = 100) -> LoadTestResults:
+        """
+        Run load testing with asyncio virtual users
 
-                except Exception as e:
-                    failed_operations += 1
-                    errors.append(f"Thread {thread_id}, Op {op_num}: {str(e)}")
-                    thread_response_times.append(0.0)  # Failed operation
+        Every operation is its own task; a semaphore keeps at most
+        concurrent_users validations in flight, each run off the event loop
+        with asyncio.to_thread. Latency is measured per awaited operation.
 
-            return thread_response_times
+        Args:
+            order_generator: Function that generates test orders
+            routes: Available routes
+            trucks: Available trucks
+            concurrent_users: Maximum operations in flight
+            operations_per_user: Operations per virtual user
 
-        # Start load test
-        start_time = time.perf_counter()
+        Returns:
+            LoadTestResults with comprehensive load test metrics
+        """
+        test_name = f"async_load_test_{concurrent_users}users_{operations_per_user}ops"
+        total_operations = concurrent_users * operations_per_user
 
-        with ThreadPoolExecutor(max_workers=concurrent_users) as executor:
-            # Submit all worker threads
-            futures = [executor.submit(worker_thread, i) for i in range(concurrent_users)]
+        route = routes[0] if routes else None
+        truck = trucks[0] if trucks else None
+        validate = self.order_processor.validate_order_for_route
+        perf_counter_ns = time.perf_counter_ns
+        semaphore = asyncio.Semaphore(concurrent_users)
 
-            # Monitor system resources during test
-            monitor_thread = threading.Thread(target=self._monitor_resources_during_test,
-                                            args=(lambda: peak_memory, lambda: peak_cpu))
-            monitor_thread.daemon = True
-            monitor_thread.start()
+        # Elapsed nanoseconds per operation; NaN marks failures
+        response_times = [math.nan] * total_operations
+        errors = []
 
-            # Collect results
-            for future in as_completed(futures):
+        async def virtual_user_op(op_num: int) -> bool:
+            async with semaphore:
                 try:
-                    thread_times = future.result()
-                    response_times.extend(thread_times)
-
-                    # Update peak memory
-                    current_memory = process.memory_info().rss / 1024 / 1024
-                    peak_memory = max(peak_memory, current_memory)
+                    order = order_generator()
+                    start_ns = perf_counter_ns()
+                    result = await asyncio.to_thread(validate, order, route, truck)
+                    response_times[op_num] = perf_counter_ns() - start_ns
+                    return result.is_valid
+                except Exception as e:
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(f"Op {op_num}: {str(e)}")
+                    return False
 
-                    # Update peak CPU
-                    current_cpu = process.cpu_percent()
-                    peak_cpu = max(peak_cpu, current_cpu)
+        stop_monitor, monitor_thread, peaks = self._start_resource_monitor()
+        start_ns = perf_counter_ns()
 
-                except Exception as e:
-                    errors.append(f"Thread execution error: {str(e)}")
+        outcomes = await asyncio.gather(*(virtual_user_op(i) for i in range(total_operations)))
 
-        end_time = time.perf_counter()
-        total_duration = end_time - start_time
+        total_duration = (perf_counter_ns() - start_ns) / 1e9
+        stop_monitor.set()
+        await asyncio.to_thread(monitor_thread.join)
 
-        # Calculate statistics
-        valid_response_times = [t for t in response_times if t > 0]
+        successful_operations = sum(outcomes)
+        return self._build_load_test_results(
+            test_name, total_operations, successful_operations,
+            total_operations - successful_operations, response_times, errors,
+            total_duration, peaks.memory.value, peaks.cpu.value
+        )
 
-        if valid_response_times:
-            avg_response_time = statistics.mean(valid_response_times)
-            min_response_time = min(valid_response_times)
-            max_response_time = max(valid_response_times)
-            percentile_95 = statistics.quantiles(valid_response_times, n=20)[18]  # 95th percentile
+    def _build_load_test_results(self, test_name: str, total_operations: int,
+                                 successful_operations: int, failed_operations: int,
+                                 response_times: List[float], errors: List[str],
+                                 total_duration: float, peak_memory: float,
+                                 peak_cpu: float) -> LoadTestResults:
+        """Compute load-test statistics from per-operation nanosecond timings (NaN = failed)"""
+        times_arr = np.fromiter(response_times, dtype=np.float64, count=len(response_times)) / 1_000_000.0
+        valid_count, total_time, min_time, max_time, valid_response_times = _reduce_stats(times_arr)
+
+        if valid_count:
+            avg_response_time = total_time / valid_count
+            min_response_time = float(min_time)
+            max_response_time = float(max_time)
+            # Nearest-rank percentiles via one O(N) selection
+            ranks = [max(0, -(-pct * valid_count // 100) - 1) for pct in (50, 95, 99)]
+            selected = np.partition(valid_response_times, ranks)
+            percentile_50, percentile_95, percentile_99 = (float(selected[r]) for r in ranks)
         else:
-            avg_response_time = min_response_time = max_response_time = percentile_95 = 0.0
+            avg_response_time = min_response_time = max_response_time = 0.0
+            percentile_50 = percentile_95 = percentile_99 = 0.0
 
         throughput = total_operations / total_duration if total_duration > 0 else 0.0
         error_rate = (failed_operations / total_operations * 100) if total_operations > 0 else 0.0
@@ -316,7 +670,9 @@ class PerformanceAssessor:
             memory_peak_mb=peak_memory,
             cpu_peak_percent=peak_cpu,
             error_rate_percent=error_rate,
-            errors=errors[:100]  # Limit error list size
+            percentile_50_ms=percentile_50,
+            percentile_99_ms=percentile_99,
+            errors=errors[:MAX_REPORTED_ERRORS]
         )
 
     def monitor_memory_usage(self, duration_seconds: int = 300,
@@ -324,6 +680,17 @@ class PerformanceAssessor:
         """
         Monitor memory usage over time with leak detection
 
+        Allocation tracing is off while memory is flat. It is switched on the
+        first time RSS rises leak_snapshot_step_mb above its high-water mark,
+        and the baseline snapshot is taken at the next RSS move of that size,
+        once tracing has seen some allocations; from then on every such move,
+        up or down, takes a snapshot that is diffed against the previous one.
+        Each allocation site counts how often it grew and shrank, and Laplace's
+        rule of succession, (shrinks + 1) / (growths + shrinks + 2), estimates
+        how likely its memory is to be reclaimed. Sites below
+        leak_reclaim_probability_threshold that grew by more than 1MB are
+        reported as likely leaks.
+
         Args:
             duration_seconds: How long to monitor (default 5 minutes)
             sample_interval_seconds: How often to sample memory
@@ -331,29 +698,72 @@ class PerformanceAssessor:
         Returns:
             MemoryReport with memory usage analysis
         """
-        process = psutil.Process()
+        process = self._process
         initial_memory = process.memory_info().rss / 1024 / 1024
         peak_memory = initial_memory
 
-        # Start memory tracing
-        tracemalloc.start()
-        initial_gc_stats = {str(i): gc.get_count()[i] for i in range(3)}
-
-        memory_samples = []
+        high_water_mb = initial_memory
+        started_tracing = False
+        previous_snapshot = None
+        snapshot_memory_mb = initial_memory
+        # Allocation site -> [times grown, times shrunk, net bytes]
+        site_stats: Dict[str, List[int]] = {}
+
+        def record_sample(snapshot):
+            for stat in snapshot.compare_to(previous_snapshot, 'lineno')[:20]:
+                if stat.size_diff:
+                    entry = site_stats.setdefault(str(stat.traceback), [0, 0, 0])
+                    entry[0 if stat.size_diff > 0 else 1] += 1
+                    entry[2] += stat.size_diff
+
+        initial_gc_counts = gc.get_count()
+
+        # Samples go into preallocated typed buffers (seconds since start, RSS MB);
+        # datetimes are only built when the report timeline is read
+        max_samples = int(duration_seconds / sample_interval_seconds) + 1
+        sample_times = array('d', bytes(8 * max_samples))
+        sample_rss = array('d', bytes(8 * max_samples))
+        samples_count = 0
         start_time = datetime.now()
-        end_time = start_time + timedelta(seconds=duration_seconds)
+        start_monotonic = time.monotonic()
+        end_monotonic = start_monotonic + duration_seconds
 
         self.memory_monitor_active = True
 
-        try:
-            while datetime.now() < end_time and self.memory_monitor_active:
-                current_time = datetime.now()
-                current_memory = process.memory_info().rss / 1024 / 1024
+        # Bind the per-sample callables once
+        monotonic = time.monotonic
+        sleep = time.sleep
+        memory_info = process.memory_info
 
-                memory_samples.append((current_time, current_memory))
+        try:
+            while samples_count < max_samples and self.memory_monitor_active:
+                current_monotonic = monotonic()
+                if current_monotonic >= end_monotonic:
+                    break
+                current_memory = memory_info().rss / 1024 / 1024
+
+                sample_times[samples_count] = current_monotonic - start_monotonic
+                sample_rss[samples_count] = current_memory
+                samples_count += 1
                 peak_memory = max(peak_memory, current_memory)
 
-                time.sleep(sample_interval_seconds)
+                if previous_snapshot is None and not started_tracing:
+                    take_snapshot = current_memory > high_water_mb + self.leak_snapshot_step_mb
+                else:
+                    take_snapshot = abs(current_memory - snapshot_memory_mb) > self.leak_snapshot_step_mb
+                if take_snapshot:
+                    if not tracemalloc.is_tracing():
+                        # A snapshot now would hold no traced allocations
+                        tracemalloc.start()
+                        started_tracing = True
+                    else:
+                        snapshot = tracemalloc.take_snapshot()
+                        if previous_snapshot is not None:
+                            record_sample(snapshot)
+                        previous_snapshot = snapshot
+                    snapshot_memory_mb = current_memory
+
+                sleep(sample_interval_seconds)
 
         finally:
             self.memory_monitor_active = False
@@ -363,10 +773,11 @@ class PerformanceAssessor:
         memory_growth = final_memory - initial_memory
 
         # Get garbage collection stats
-        final_gc_stats = {str(i): gc.get_count()[i] for i in range(3)}
+        gc0, gc1, gc2 = gc.get_count()
         gc_collections = {
-            gen: final_gc_stats[gen] - initial_gc_stats[gen]
-            for gen in initial_gc_stats
+            0: gc0 - initial_gc_counts[0],
+            1: gc1 - initial_gc_counts[1],
+            2: gc2 - initial_gc_counts[2],
         }
 
         # Detect potential memory leaks
@@ -375,28 +786,23 @@ class PerformanceAssessor:
             potential_leaks.append(f"Memory growth of {memory_growth:.1f}MB exceeds threshold")
 
         # Check for consistent memory growth pattern
-        if len(memory_samples) > 10:
-            recent_samples = memory_samples[-10:]
-            early_samples = memory_samples[:10]
-
-            recent_avg = statistics.mean([sample[1] for sample in recent_samples])
-            early_avg = statistics.mean([sample[1] for sample in early_samples])
+        if samples_count > 10:
+            recent_avg = statistics.mean(sample_rss[samples_count - 10:samples_count])
+            early_avg = statistics.mean(sample_rss[:10])
 
             if recent_avg > early_avg * 1.2:  # 20% growth
                 potential_leaks.append("Consistent memory growth pattern detected")
 
-        # Get memory tracing snapshot
+        # Score allocation sites by how likely their memory is to be reclaimed
         try:
-            snapshot = tracemalloc.take_snapshot()
-            top_stats = snapshot.statistics('lineno')[:10]
-
-            for stat in top_stats:
-                if stat.size > 1024 * 1024:  # > 1MB
-                    potential_leaks.append(f"Large allocation: {stat.size / 1024 / 1024:.1f}MB at {stat.traceback}")
+            if previous_snapshot is not None and tracemalloc.is_tracing():
+                record_sample(tracemalloc.take_snapshot())
+            potential_leaks.extend(self._score_leak_sites(site_stats))
         except Exception:
             pass  # Memory tracing might not be available
-
-        tracemalloc.stop()
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
 
         return MemoryReport(
             process_id=process.pid,
@@ -406,10 +812,36 @@ class PerformanceAssessor:
             gc_collections=gc_collections,
             potential_leaks=potential_leaks,
             monitoring_duration_seconds=duration_seconds,
-            samples_count=len(memory_samples),
-            memory_timeline=memory_samples
+            samples_count=samples_count,
+            sample_offsets=sample_times[:samples_count],
+            sample_rss_mb=sample_rss[:samples_count],
+            start_time=start_time
         )
 
+    def _score_leak_sites(self, site_stats: Dict[str, List[int]], limit: int = 5) -> List[str]:
+        """
+        Report the allocation sites least likely to have their memory reclaimed
+
+        Args:
+            site_stats: Allocation site -> [times grown, times shrunk, net bytes]
+            limit: Maximum number of sites reported
+
+        Returns:
+            Leak messages, most likely leak first
+        """
+        leak_sites = []
+        for site, (grown, shrunk, net_bytes) in site_stats.items():
+            reclaim_probability = (shrunk + 1) / (grown + shrunk + 2)
+            if (reclaim_probability < self.leak_reclaim_probability_threshold
+                    and net_bytes > 1024 * 1024):  # > 1MB
+                leak_sites.append((reclaim_probability, -net_bytes, site))
+
+        return [
+            f"Likely leak ({1 - reclaim_probability:.0%}): "
+            f"+{-neg_bytes / 1024 / 1024:.1f}MB at {site}"
+            for reclaim_probability, neg_bytes, site in sorted(leak_sites)[:limit]
+        ]
+
     def run_benchmarks(self, test_scenarios: Dict[str, Callable[[], PerformanceMetrics]]) -> Dict[str, BenchmarkResults]:
         """
         Run benchmark tests comparing against baseline performance
@@ -421,6 +853,7 @@ class PerformanceAssessor:
             Dictionary of benchmark results
         """
         results = {}
+        max_time_ms = self.max_order_processing_time_ms
 
         for test_name, test_function in test_scenarios.items():
             try:
@@ -450,23 +883,22 @@ class PerformanceAssessor:
 
                 # Check if meets requirements
                 meets_requirements = (
-                    current_metrics.execution_time_ms <= self.max_order_processing_time_ms and
+                    current_metrics.execution_time_ms <= max_time_ms and
                     current_metrics.success
                 )
 
-                # Generate recommendations
+                # Generate recommendations; messages are only formatted for failed checks
+                flags = (
+                    (current_metrics.execution_time_ms > max_time_ms)
+                    | regression_detected << 1
+                    | (current_metrics.memory_usage_mb > 100) << 2
+                    | (not current_metrics.success) << 3
+                )
                 recommendations = []
-                if current_metrics.execution_time_ms > self.max_order_processing_time_ms:
-                    recommendations.append(f"Execution time {current_metrics.execution_time_ms:.1f}ms exceeds 5-second limit")
-
-                if regression_detected:
-                    recommendations.append(f"Performance regression detected: {performance_change:.1f}% slower")
-
-                if current_metrics.memory_usage_mb > 100:
-                    recommendations.append(f"High memory usage: {current_metrics.memory_usage_mb:.1f}MB")
-
-                if not current_metrics.success:
-                    recommendations.append(f"Test failed: {current_metrics.error_message}")
+                if flags:
+                    for bit, message in enumerate(_BENCHMARK_RECOMMENDATIONS):
+                        if flags >> bit & 1:
+                            recommendations.append(message(current_metrics, performance_change))
 
                 results[test_name] = BenchmarkResults(
                     benchmark_name=test_name,
@@ -511,28 +943,119 @@ class PerformanceAssessor:
         """Get performance history, optionally filtered by operation name"""
         if operation_name:
             return [m for m in self.performance_history if m.operation_name == operation_name]
-        return self.performance_history.copy()
+        return list(self.performance_history)
+
+    def _record_metrics(self, metrics: PerformanceMetrics):
+        """Append metrics to the history and its column arrays"""
+        self.performance_history.append(metrics)
+        self._last_recorded = metrics
+        self._exec_ms.append(metrics.execution_time_ms)
+        self._mem_mb.append(metrics.memory_usage_mb)
+        self._success.append(metrics.success)
+
+        # Drop columns evicted from the history in batches, not one per append
+        max_history = self.performance_history.maxlen
+        if max_history is not None and len(self._exec_ms) >= 2 * max_history:
+            excess = len(self._exec_ms) - max_history
+            del self._exec_ms[:excess]
+            del self._mem_mb[:excess]
+            del self._success[:excess]
+
+    def _metric_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        NumPy views of execution time, memory usage and success per history entry
+
+        The columns are rebuilt if the history was modified directly.
+        """
+        history = self.performance_history
+        if (len(self._exec_ms) < len(history)
+                or (history and history[-1] is not self._last_recorded)):
+            self._exec_ms = array('d', (m.execution_time_ms for m in history))
+            self._mem_mb = array('d', (m.memory_usage_mb for m in history))
+            self._success = array('b', (m.success for m in history))
+            self._last_recorded = history[-1] if history else None
+
+        start = len(self._exec_ms) - len(history)
+        return (
+            np.frombuffer(self._exec_ms, dtype=np.float64)[start:],
+            np.frombuffer(self._mem_mb, dtype=np.float64)[start:],
+            np.frombuffer(self._success, dtype=np.int8)[start:].astype(bool),
+        )
 
     def stop_memory_monitoring(self):
         """Stop active memory monitoring"""
         self.memory_monitor_active = False
 
-    def _monitor_resources_during_test(self, peak_memory_ref, peak_cpu_ref):
-        """Internal method to monitor resources during load testing"""
-        process = psutil.Process()
+    def _start_resource_monitor(self, include_children: bool = True
+                                ) -> Tuple[threading.Event, threading.Thread, ResourcePeaks]:
+        """
+        Start a daemon thread that samples memory and CPU in the background
 
+        Args:
+            include_children: Add the RSS and CPU of child processes (load-test
+                workers) to each sample
+
+        Returns:
+            The stop event, the monitor thread and the ResourcePeaks it
+            writes. Set the event and join the thread, then read the peaks
+            through their .value attributes.
+        """
+        stop_event = threading.Event()
+        peaks = ResourcePeaks()
+        # Prime cpu_percent so the monitor's samples cover only this run
+        self._process.cpu_percent(interval=None)
+        # First sample is taken here so the thread only wakes once per interval
+        children: Optional[Dict[int, psutil.Process]] = {} if include_children else None
+        self._sample_resources(children, peaks)
+        monitor_thread = threading.Thread(target=self._monitor_resources_during_test,
+                                          args=(stop_event, children, peaks))
+        monitor_thread.daemon = True
+        monitor_thread.start()
+        return stop_event, monitor_thread, peaks
+
+    def _monitor_resources_during_test(self, stop_event: threading.Event,
+                                       children: Optional[Dict[int, psutil.Process]],
+                                       peaks: ResourcePeaks):
+        """Internal method to monitor resources during load testing"""
         while True:
-            try:
-                current_memory = process.memory_info().rss / 1024 / 1024
-                current_cpu = process.cpu_percent()
+            stopped = stop_event.wait(self.resource_sample_interval_seconds)
+            # One last sample is taken after the stop request
+            if not self._sample_resources(children, peaks) or stopped:
+                break
 
-                # Update peaks (this is a simplified approach)
-                # In a real implementation, you'd use proper shared state
+    def _sample_resources(self, children: Optional[Dict[int, psutil.Process]],
+                          peaks: ResourcePeaks) -> bool:
+        """
+        Take one memory/CPU sample of this process (and its children) into the peaks
 
-                time.sleep(0.5)  # Sample every 500ms
+        Child handles are kept in children so cpu_percent() has a previous
+        sample to diff; with children=None only this process is sampled.
+        Returns False if the process can no longer be read.
+        """
+        process = self._proc
+        # Read the epoch first so a sample is never credited to a later interval
+        epoch = peaks.epoch.value
+        try:
+            current_rss = process.memory_info().rss
+            current_cpu = process.cpu_percent()
+        except Exception:
+            return False
 
-            except Exception:
-                break  # Exit if process monitoring fails
+        # Include load-test worker processes
+        if children is not None:
+            try:
+                for child in process.children(recursive=True):
+                    child = children.setdefault(child.pid, child)
+                    try:
+                        current_rss += child.memory_info().rss
+                        current_cpu += child.cpu_percent()
+                    except psutil.Error:
+                        children.pop(child.pid, None)
+            except psutil.Error:
+                pass
+
+        peaks.record(epoch, current_rss / 1024 / 1024, current_cpu)
+        return True
 
     def generate_performance_report(self) -> Dict[str, Any]:
         """
@@ -551,28 +1074,34 @@ class PerformanceAssessor:
 
         if self.performance_history:
             # Calculate summary statistics
-            recent_metrics = self.performance_history[-10:]  # Last 10 operations
-
-            execution_times = [m.execution_time_ms for m in recent_metrics if m.success]
-            memory_usage = [m.memory_usage_mb for m in recent_metrics if m.success]
-            success_rate = sum(1 for m in recent_metrics if m.success) / len(recent_metrics) * 100
-
-            if execution_times:
+            recent_metrics = list(islice(reversed(self.performance_history), 10))[::-1]  # Last 10 operations
+
+            exec_ms, mem_mb, success = self._metric_columns()
+            recent_success = success[-10:]
+            execution_times = exec_ms[-10:][recent_success]
+            memory_usage = mem_mb[-10:][recent_success]
+            success_rate = float(recent_success.mean()) * 100
+
+            if execution_times.size:
+                avg_time = float(execution_times.mean())
+                max_time = float(execution_times.max())
+                min_time = float(execution_times.min())
                 report['summary'] = {
-                    'average_execution_time_ms': statistics.mean(execution_times),
-                    'max_execution_time_ms': max(execution_times),
-                    'min_execution_time_ms': min(execution_times),
+                    'average_execution_time_ms': avg_time,
+                    'max_execution_time_ms': max_time,
+                    'min_execution_time_ms': min_time,
                     'success_rate_percent': success_rate,
-                    'average_memory_usage_mb': statistics.mean(memory_usage) if memory_usage else 0,
+                    'average_memory_usage_mb': float(memory_usage.mean()),
                     'total_operations': len(self.performance_history)
                 }
+            else:
+                avg_time = max_time = min_time = 0
 
             # Check compliance with requirements
-            avg_time = statistics.mean(execution_times) if execution_times else 0
             report['compliance'] = {
                 'meets_5_second_requirement': avg_time <= self.max_order_processing_time_ms,
                 'acceptable_success_rate': success_rate >= (100 - self.max_acceptable_error_rate),
-                'performance_stable': max(execution_times) - min(execution_times) <= 2000 if len(execution_times) > 1 else True
+                'performance_stable': max_time - min_time <= 2000 if execution_times.size > 1 else True
             }
 
             # Generate recommendations
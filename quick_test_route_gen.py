@@ -5,9 +5,20 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath('.'))
 
-from sqlmodel import Session
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
 from app.database import engine, Route, Location
 
+if __name__ == "__main__":
+    # Debug runs only need throwaway rows, so they use a private in-memory
+    # database instead of the project's file-backed one
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+
 # Test the Route path functionality directly
 with Session(engine) as session:
     # Create test locations
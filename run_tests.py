@@ -14,6 +14,7 @@ Usage:
 import sys
 import os
 import subprocess
+import importlib.util
 from pathlib import Path
 
 # Add project root to Python path
@@ -41,6 +42,10 @@ SLOW_TESTS = [
     "tests/test_osmnx_basic.py"
 ]
 
+# Categories distributed over pytest-xdist workers when it is installed
+# (integration and performance stay serial, they share DB fixtures)
+PARALLEL_CATEGORIES = {"core", "safe", "all"}
+
 def run_tests(category="core"):
     """Run tests by category"""
     
@@ -54,6 +59,8 @@ def run_tests(category="core"):
         
     elif category == "performance":
         cmd = [sys.executable, "-m", "pytest"] + PERFORMANCE_TESTS + ["-v", "--maxfail=2", "--timeout=900"]
+        # Compiled Numba kernels are cached in the project, so only the first run compiles them
+        os.environ.setdefault("NUMBA_CACHE_DIR", str(project_root / ".numba_cache"))
         print("⚡ Running performance tests...")
         
     elif category == "all":
@@ -72,6 +79,10 @@ def run_tests(category="core"):
         cmd = [sys.executable, "-m", "pytest", f"tests/{category}.py", "-v"]
         print(f"🎯 Running specific test: {category}")
     
+    if category in PARALLEL_CATEGORIES and importlib.util.find_spec("xdist") is not None:
+        cmd.extend(["-n", "auto", "--dist=loadfile"])
+    cmd.append("--durations=10")
+    
     result = subprocess.run(cmd)
     return result.returncode
 
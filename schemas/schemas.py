@@ -7,12 +7,16 @@ These models serve as the single source of truth for:
 3. Database ORM compatibility
 """
 
-from pydantic import BaseModel
-from typing import Optional, List, Set
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, FrozenSet, Optional, List, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 import math
 
+import numpy as np
+
 
 # ============= ENUMS =============
 
@@ -23,28 +27,113 @@ class CargoType(str, Enum):
     REFRIGERATED = "refrigerated"
 
 
+# Cargo types that may not share a truck
+INCOMPATIBLE_CARGO_TYPE_PAIRS = (
+    (CargoType.HAZMAT, CargoType.FRAGILE),
+    (CargoType.HAZMAT, CargoType.REFRIGERATED),
+)
+
+# Each cargo type mapped to the types it cannot travel with
+INCOMPATIBLE_CARGO_TYPES = {
+    cargo_type: frozenset(
+        second if first == cargo_type else first
+        for first, second in INCOMPATIBLE_CARGO_TYPE_PAIRS
+        if cargo_type in (first, second)
+    )
+    for cargo_type in CargoType
+}
+
+
+# One bit per cargo type, so a cargo's types and a truck's allowed types
+# compare with a single mask test
+CARGO_TYPE_BITS = {
+    CargoType.STANDARD: 1,
+    CargoType.FRAGILE: 2,
+    CargoType.HAZMAT: 4,
+    CargoType.REFRIGERATED: 8,
+}
+
+# Refrigerated and hazmat cargo need a truck of that type; every other
+# truck type carries standard and fragile cargo only
+_BASIC_CARGO_MASK = CARGO_TYPE_BITS[CargoType.STANDARD] | CARGO_TYPE_BITS[CargoType.FRAGILE]
+TRUCK_ALLOWED_CARGO_MASKS = {
+    "refrigerated": _BASIC_CARGO_MASK | CARGO_TYPE_BITS[CargoType.REFRIGERATED],
+    "hazmat": _BASIC_CARGO_MASK | CARGO_TYPE_BITS[CargoType.HAZMAT],
+}
+
+# Cargo aggregates cached in the instance __dict__ and reset together
+CARGO_PACKAGE_CACHES = ("_package_totals", "type_mask", "_types")
+
+# Paths with at least this many points are summed in one array pass
+VECTORIZED_PATH_MIN_POINTS = 4
+
+EARTH_RADIUS_KM = 6371
+
+
+def _distance_to(self, other) -> float:
+    """Calculate distance to another location using Haversine formula"""
+    # Shared by Location and LocationCore, which expose the same radians
+    a = (math.sin((other.lat_rad - self.lat_rad) / 2) ** 2
+         + self.cos_lat_rad * other.cos_lat_rad
+         * math.sin((other.lng_rad - self.lng_rad) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+@dataclass(slots=True, frozen=True)
+class LocationCore:
+    """
+    Slotted, validation-free point for distance-heavy loops.
+    Radians are computed once at construction; it mixes freely with
+    Location in distance_to since both expose the same attributes.
+    """
+    lat: float
+    lng: float
+    lat_rad: float = field(init=False)
+    lng_rad: float = field(init=False)
+    cos_lat_rad: float = field(init=False)
+    
+    def __post_init__(self):
+        lat_rad = math.radians(self.lat)
+        object.__setattr__(self, "lat_rad", lat_rad)
+        object.__setattr__(self, "lng_rad", math.radians(self.lng))
+        object.__setattr__(self, "cos_lat_rad", math.cos(lat_rad))
+    
+    distance_to = _distance_to
+
+
 # ============= MODELS WITH BUSINESS LOGIC =============
 
 class Location(BaseModel):
-    """Location model with geographic calculations"""
+    """Location model with geographic calculations (immutable once created)"""
     id: Optional[int] = None
     lat: float
     lng: float
     marked: bool = False
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    # Coordinates never change, so their radian forms are computed once
+    @cached_property
+    def lat_rad(self) -> float:
+        return math.radians(self.lat)
+    
+    @cached_property
+    def lng_rad(self) -> float:
+        return math.radians(self.lng)
     
-    def distance_to(self, other: "Location") -> float:
-        """Calculate distance to another location using Haversine formula"""
-        R = 6371  # Earth radius in km
-        lat1, lng1 = math.radians(self.lat), math.radians(self.lng)
-        lat2, lng2 = math.radians(other.lat), math.radians(other.lng)
-        dlat = lat2 - lat1
-        dlng = lng2 - lng1
-        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
+    @cached_property
+    def cos_lat_rad(self) -> float:
+        return math.cos(self.lat_rad)
+    
+    @cached_property
+    def _core(self) -> LocationCore:
+        return LocationCore(self.lat, self.lng)
+    
+    def core(self) -> LocationCore:
+        """Slotted LocationCore view of this location (built once)"""
+        return self._core
+    
+    distance_to = _distance_to
     
     @property
     def coordinates(self) -> tuple:
@@ -64,8 +153,7 @@ class Client(BaseModel):
     locations: List["Location"] = []
     orders: List["Order"] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Package(BaseModel):
@@ -76,8 +164,7 @@ class Package(BaseModel):
     type: CargoType
     cargo_id: Optional[int] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Cargo(BaseModel):
@@ -89,36 +176,71 @@ class Cargo(BaseModel):
     truck: Optional["Truck"] = None
     packages: List["Package"] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name == "packages":
+            self.invalidate()
+    
+    def invalidate(self) -> None:
+        """Drop the cached package aggregates; call after editing packages in place"""
+        for name in CARGO_PACKAGE_CACHES:
+            self.__dict__.pop(name, None)
+    
+    @cached_property
+    def _package_totals(self) -> tuple:
+        """
+        (volume, weight) summed over packages.
+        Reset when packages is reassigned and kept current by add_package;
+        mutating the packages list in place needs an invalidate() call.
+        """
+        return (sum(p.volume for p in self.packages),
+                sum(p.weight for p in self.packages))
+    
+    @cached_property
+    def type_mask(self) -> int:
+        """CARGO_TYPE_BITS of every package type OR-ed together, cached like the totals"""
+        mask = 0
+        for p in self.packages:
+            mask |= CARGO_TYPE_BITS.get(p.type, 0)
+        return mask
+    
+    def add_package(self, package: "Package") -> None:
+        """Append a package, updating the cached totals instead of re-summing"""
+        self.packages.append(package)
+        if "_package_totals" in self.__dict__:
+            volume, weight = self.__dict__["_package_totals"]
+            self.__dict__["_package_totals"] = (volume + package.volume,
+                                                weight + package.weight)
+        if "type_mask" in self.__dict__:
+            self.__dict__["type_mask"] |= CARGO_TYPE_BITS.get(package.type, 0)
+        if "_types" in self.__dict__:
+            self.__dict__["_types"] = self.__dict__["_types"] | {package.type}
     
     def total_volume(self) -> float:
         """Calculate total volume of all packages in this cargo"""
-        return sum(p.volume for p in self.packages)
+        return self._package_totals[0]
     
     def total_weight(self) -> float:
         """Calculate total weight of all packages in this cargo"""
-        return sum(p.weight for p in self.packages)
+        return self._package_totals[1]
+    
+    @cached_property
+    def _types(self) -> FrozenSet[CargoType]:
+        return frozenset(p.type for p in self.packages)
     
-    def get_types(self) -> Set[CargoType]:
-        """Get unique cargo types in this shipment"""
-        return {p.type for p in self.packages}
+    def get_types(self) -> FrozenSet[CargoType]:
+        """Get unique cargo types in this shipment (cached like the totals)"""
+        return self._types
     
     def is_compatible_with(self, other_cargo: "Cargo") -> bool:
         """Check if this cargo is compatible with another cargo"""
-        incompatible_pairs = [
-            (CargoType.HAZMAT, CargoType.FRAGILE),
-            (CargoType.HAZMAT, CargoType.REFRIGERATED)
-        ]
-        
-        my_types = self.get_types()
         other_types = other_cargo.get_types()
-        
-        for type1, type2 in incompatible_pairs:
-            if (type1 in my_types and type2 in other_types) or \
-               (type2 in my_types and type1 in other_types):
-                return False
-        return True
+        return all(
+            INCOMPATIBLE_CARGO_TYPES.get(cargo_type, frozenset()).isdisjoint(other_types)
+            for cargo_type in self.get_types()
+        )
 
 
 class Order(BaseModel):
@@ -136,8 +258,7 @@ class Order(BaseModel):
     location_origin: Optional["Location"] = None
     location_destiny: Optional["Location"] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
     
     def total_distance(self) -> float:
         """Calculate pickup to dropoff distance"""
@@ -175,8 +296,7 @@ class Route(BaseModel):
     # Additional path waypoints (not in DB but useful for calculations)
     path: List["Location"] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
     
     def base_distance(self) -> float:
         """Distance from origin to destination"""
@@ -188,12 +308,31 @@ class Route(BaseModel):
         """Calculate total distance including all waypoints"""
         if len(self.path) < 2:
             return self.base_distance()
+        if len(self.path) >= VECTORIZED_PATH_MIN_POINTS:
+            return self._path_distance_vec()
         
         total = 0.0
         for i in range(len(self.path) - 1):
             total += self.path[i].distance_to(self.path[i + 1])
         return total
     
+    def _path_distance_vec(self) -> float:
+        """
+        Haversine sum over consecutive path points, computed by the compiled
+        path_length kernel when Numba is available and with NumPy otherwise
+        """
+        from utils.geom import NUMBA_AVAILABLE, path_length
+        
+        if NUMBA_AVAILABLE:
+            return float(path_length(np.array([p.lat for p in self.path]),
+                                     np.array([p.lng for p in self.path])))
+        
+        lats = np.radians([p.lat for p in self.path])
+        lngs = np.radians([p.lng for p in self.path])
+        a = (np.sin(np.diff(lats) / 2) ** 2
+             + np.cos(lats[:-1]) * np.cos(lats[1:]) * np.sin(np.diff(lngs) / 2) ** 2)
+        return float(2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0))).sum())
+    
     def total_time(self, base_speed_kmh: float = 80.0) -> float:
         """
         Calculate total route time in hours
@@ -231,15 +370,13 @@ class Truck(BaseModel):
     routes: List["Route"] = []
     cargo_loads: List["Cargo"] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
     
     def available_capacity(self) -> float:
         """Calculate remaining capacity"""
         if self.capacity <= 0:
             return 0.0
-        used = sum(cargo.total_volume() for cargo in self.cargo_loads)
-        return max(0.0, self.capacity - used)
+        return max(0.0, self.capacity - self.total_cargo_volume())
     
     def can_fit(self, volume: float) -> bool:
         """Check if truck can accommodate additional volume"""
@@ -277,25 +414,27 @@ class Truck(BaseModel):
         """Calculate capacity utilization percentage"""
         if self.capacity <= 0:
             return 0.0
-        used = sum(cargo.total_volume() for cargo in self.cargo_loads)
-        return min(100.0, (used / self.capacity) * 100)
+        return min(100.0, (self.total_cargo_volume() / self.capacity) * 100)
+    
+    def capacity_stats(self) -> tuple:
+        """
+        Return (used, available, utilization percent) from a single pass
+        over the loaded cargo
+        """
+        used = self.total_cargo_volume()
+        if self.capacity <= 0:
+            return used, 0.0, 0.0
+        return (used,
+                max(0.0, self.capacity - used),
+                min(100.0, (used / self.capacity) * 100))
     
     def is_compatible_with_cargo(self, cargo: "Cargo") -> bool:
         """Check if truck type is compatible with cargo type"""
-        if not cargo or not cargo.packages:
+        if not cargo:
             return True
         
-        cargo_types = cargo.get_types()
-        
-        # Refrigerated trucks needed for refrigerated cargo
-        if CargoType.REFRIGERATED in cargo_types and self.type != "refrigerated":
-            return False
-        
-        # Hazmat certified trucks needed for hazmat cargo
-        if CargoType.HAZMAT in cargo_types and self.type != "hazmat":
-            return False
-        
-        return True
+        allowed = TRUCK_ALLOWED_CARGO_MASKS.get(self.type, _BASIC_CARGO_MASK)
+        return cargo.type_mask & ~allowed == 0
     
     def get_capacity_after_drop(self, route: "Route", drop_location: "Location") -> float:
         """Calculate remaining capacity after dropping cargo at specified location"""
@@ -366,41 +505,56 @@ def create_order_from_dict(order_data: dict) -> Order:
     Helper to create Order from dictionary format
     Used for API compatibility with legacy format
     """
+    return create_orders_from_dicts([order_data])[0]
+
+
+def create_orders_from_dicts(
+    orders_data: List[dict],
+    *,
+    location_cache: Optional[Dict[Tuple[float, float], Location]] = None
+) -> List[Order]:
+    """
+    Create Orders from a batch of legacy-format dictionaries.
+    Orders with the same pickup or dropoff coordinates share one Location
+    instance; pass location_cache to share them across batches too.
+    """
     # This creates schema objects, not DB objects
     # For DB operations, use the database.py version
-    
-    origin = Location(
-        lat=order_data['pick-up']['latitude'],
-        lng=order_data['pick-up']['longitude']
-    )
-    
-    destiny = Location(
-        lat=order_data['drop-off']['latitude'],
-        lng=order_data['drop-off']['longitude']
-    )
-    
-    packages = []
-    for pkg_data in order_data['cargo']['packages']:
-        package = Package(
-            volume=pkg_data[0],
-            weight=pkg_data[1],
-            type=CargoType(pkg_data[2])
+    if location_cache is None:
+        location_cache = {}
+    
+    def get_location(point: dict) -> Location:
+        key = (point['latitude'], point['longitude'])
+        location = location_cache.get(key)
+        if location is None:
+            location = Location(lat=key[0], lng=key[1])
+            location_cache[key] = location
+        return location
+    
+    orders = []
+    for order_data in orders_data:
+        packages = [
+            Package(
+                volume=pkg_data[0],
+                weight=pkg_data[1],
+                type=CargoType(pkg_data[2])
+            )
+            for pkg_data in order_data['cargo']['packages']
+        ]
+        
+        # Note: This creates schema objects for validation/calculation
+        # Actual DB persistence needs proper IDs and session handling
+        cargo = Cargo(
+            order_id=0,  # Placeholder - will be set when saved to DB
+            packages=packages
         )
-        packages.append(package)
-    
-    # Note: This creates schema objects for validation/calculation
-    # Actual DB persistence needs proper IDs and session handling
-    cargo = Cargo(
-        order_id=0,  # Placeholder - will be set when saved to DB
-        packages=packages
-    )
-    
-    order = Order(
-        location_origin_id=0,  # Placeholder
-        location_destiny_id=0,  # Placeholder
-        location_origin=origin,
-        location_destiny=destiny,
-        cargo=[cargo]
-    )
-    
-    return order
\ No newline at end of file
+        
+        orders.append(Order(
+            location_origin_id=0,  # Placeholder
+            location_destiny_id=0,  # Placeholder
+            location_origin=get_location(order_data['pick-up']),
+            location_destiny=get_location(order_data['drop-off']),
+            cargo=[cargo]
+        ))
+    
+    return orders
@@ -9,6 +9,8 @@ import logging
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Set
 from itertools import combinations
+
+import numpy as np
 from sqlmodel import Session, select
 
 # Import existing models and validation
@@ -264,20 +266,12 @@ class CargoAggregationService:
         if len(locations) < 2:
             return 50.0  # Neutral score if insufficient location data
         
-        # Calculate average distance between all location pairs
-        total_distance = 0.0
-        pair_count = 0
-        
-        for i in range(len(locations)):
-            for j in range(i + 1, len(locations)):
-                distance = locations[i].distance_to(locations[j])
-                total_distance += distance
-                pair_count += 1
-        
-        if pair_count == 0:
-            return 50.0
-        
-        average_distance = total_distance / pair_count
+        from utils.geom import compute_distance_matrix
+
+        # Calculate average distance between all location pairs, taken from
+        # the upper triangle of one distance matrix
+        distances = compute_distance_matrix(locations, locations)
+        average_distance = float(distances[np.triu_indices(len(locations), k=1)].mean())
         
         # Score inversely related to average distance
         # Distances under 100km get high scores, over 500km get low scores
@@ -436,7 +436,7 @@ class BoundingBox:
         dlat = lat2 - lat1
         dlng = lng2 - lng1
         a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        c = 2 * math.asin(math.sqrt(min(a, 1.0)))
         return R * c
 
     def area_km2(self) -> float:
@@ -0,0 +1,11 @@
+"""
+Pytest fixtures for the performance tests
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_jit_kernels():
+    """Compile (or load from the cache) the Numba kernels once, before any timed test"""
+    import utils.geom  # noqa: F401  (importing warms the kernels up)
@@ -0,0 +1,237 @@
+"""
+Unit tests for the performance assessor's statistics and resource tracking.
+
+Checks the Numba response-time reduction and percentiles against the
+standard library and NumPy on fixed inputs, the leak-site scoring and the
+resource monitor's per-slice peaks.
+"""
+
+import math
+import statistics
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add parent directories to path
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from performance.performance_assessor import (
+    MAX_REPORTED_ERRORS,
+    PerformanceAssessor,
+    ResourcePeaks,
+    _execute_load_test_ops,
+    _reduce_stats,
+)
+
+
+class TestReduceStats:
+    """Tests for the single-pass response-time reduction."""
+
+    def test_matches_statistics_ignoring_nan(self):
+        """Test count, sum, min, max and compaction with failures as NaN."""
+        rng = np.random.default_rng(7)
+        arr = rng.uniform(0.5, 250.0, 500)
+        arr[::7] = np.nan
+        expected = [float(v) for v in arr if not math.isnan(v)]
+
+        count, total, mn, mx, valid = _reduce_stats(arr)
+
+        assert count == len(expected)
+        assert total == pytest.approx(math.fsum(expected))
+        assert total / count == pytest.approx(statistics.mean(expected))
+        assert mn == min(expected)
+        assert mx == max(expected)
+        np.testing.assert_array_equal(valid, expected)
+
+    def test_all_failed(self):
+        """Test that an all-NaN input reduces to nothing."""
+        count, total, mn, mx, valid = _reduce_stats(np.full(5, np.nan))
+
+        assert count == 0
+        assert total == 0.0
+        assert valid.shape == (0,)
+
+
+class TestLoadTestPercentiles:
+    """Tests for the load-test statistics built from nanosecond timings."""
+
+    def setup_method(self):
+        self.assessor = PerformanceAssessor()
+
+    def _build(self, response_times_ns, failed=0):
+        return self.assessor._build_load_test_results(
+            "percentiles", len(response_times_ns), len(response_times_ns) - failed, failed,
+            response_times_ns, [], 1.0, 0.0, 0.0
+        )
+
+    @pytest.mark.parametrize("size", [1, 7, 20, 100, 101, 999])
+    def test_percentiles_match_numpy_nearest_rank(self, size):
+        """Test p50/p95/p99 against np.percentile's nearest-rank method."""
+        rng = np.random.default_rng(size)
+        times_ms = rng.permutation(rng.uniform(1.0, 100.0, size))
+
+        results = self._build(list(times_ms * 1_000_000.0))
+
+        expected = np.percentile(times_ms, [50, 95, 99], method='inverted_cdf')
+        actual = [results.percentile_50_ms, results.percentile_95_ms, results.percentile_99_ms]
+        np.testing.assert_allclose(actual, expected)
+        assert results.average_response_time_ms == pytest.approx(statistics.mean(times_ms))
+        assert results.min_response_time_ms == pytest.approx(times_ms.min())
+        assert results.max_response_time_ms == pytest.approx(times_ms.max())
+
+    def test_failed_operations_are_excluded(self):
+        """Test that NaN timings neither count towards nor skew the statistics."""
+        times_ns = [float(ms * 1_000_000) for ms in range(1, 101)] + [math.nan] * 10
+
+        results = self._build(times_ns, failed=10)
+
+        assert results.percentile_50_ms == pytest.approx(50.0)
+        assert results.percentile_95_ms == pytest.approx(95.0)
+        assert results.percentile_99_ms == pytest.approx(99.0)
+        assert results.average_response_time_ms == pytest.approx(50.5)
+        assert results.error_rate_percent == pytest.approx(10 / 110 * 100)
+
+
+class TestExecuteLoadTestOps:
+    """Tests for one load-test worker's operation loop."""
+
+    def _processor(self, outcomes):
+        """Stub processor returning (or raising) the given outcomes in order."""
+        outcomes = iter(outcomes)
+
+        def validate(order, route, truck):
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return SimpleNamespace(is_valid=outcome)
+
+        return SimpleNamespace(validate_order_for_route=validate)
+
+    def test_aggregates_successes_and_failures(self):
+        """Test counts, timings and errors across mixed outcomes."""
+        generated = iter([object(), ValueError("bad order"), object(), object(), object()])
+
+        def order_generator():
+            item = next(generated)
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+        processor = self._processor([True, False, RuntimeError("boom"), True])
+
+        successes, failures, times, errors = _execute_load_test_ops(
+            processor, order_generator, None, None, 3, 5
+        )
+
+        assert (successes, failures) == (2, 3)
+        assert len(times) == 5
+        # Generation and validation errors leave no timing behind
+        assert math.isnan(times[1]) and math.isnan(times[3])
+        assert all(t >= 0 for i, t in enumerate(times) if i not in (1, 3))
+        assert errors == ["Worker 3, Op 1: bad order", "Worker 3, Op 3: boom"]
+
+    def test_error_messages_are_capped(self):
+        """Test that only MAX_REPORTED_ERRORS messages are kept while all failures count."""
+        operations = MAX_REPORTED_ERRORS + 25
+        processor = self._processor([RuntimeError("down")] * operations)
+
+        successes, failures, times, errors = _execute_load_test_ops(
+            processor, object, None, None, 0, operations
+        )
+
+        assert (successes, failures) == (0, operations)
+        assert len(errors) == MAX_REPORTED_ERRORS
+        assert errors[-1] == f"Worker 0, Op {MAX_REPORTED_ERRORS - 1}: down"
+        assert all(math.isnan(t) for t in times)
+
+
+class TestLeakSiteScoring:
+    """Tests for scoring allocation sites by their chance of being reclaimed."""
+
+    MB = 1024 * 1024
+
+    def setup_method(self):
+        self.assessor = PerformanceAssessor()
+
+    def test_sites_that_only_grow_are_reported(self):
+        """Test the rule-of-succession score and the 1MB net-growth floor."""
+        site_stats = {
+            "cache.py:10": [4, 0, 8 * self.MB],     # reclaim 1/6
+            "buffers.py:5": [2, 0, 3 * self.MB],    # reclaim 1/4
+            "small.py:1": [9, 0, self.MB // 2],     # grew, but under 1MB
+            "pool.py:7": [3, 3, 2 * self.MB],       # reclaim 4/8, at the threshold
+            "churn.py:2": [2, 6, 5 * self.MB],      # reclaim 7/10
+        }
+
+        leaks = self.assessor._score_leak_sites(site_stats)
+
+        assert leaks == [
+            "Likely leak (83%): +8.0MB at cache.py:10",
+            "Likely leak (75%): +3.0MB at buffers.py:5",
+        ]
+
+    def test_ties_rank_larger_growth_first_and_respect_limit(self):
+        """Test ordering by probability, then net bytes, capped at the limit."""
+        site_stats = {f"site{i}.py:1": [1, 0, (i + 2) * self.MB] for i in range(8)}
+
+        leaks = self.assessor._score_leak_sites(site_stats, limit=3)
+
+        assert [leak.rsplit(" at ", 1)[1] for leak in leaks] == [
+            "site7.py:1", "site6.py:1", "site5.py:1"
+        ]
+
+    def test_threshold_is_configurable(self):
+        """Test that raising the threshold reports less certain sites."""
+        site_stats = {"pool.py:7": [3, 3, 2 * self.MB]}
+        assert self.assessor._score_leak_sites(site_stats) == []
+
+        self.assessor.leak_reclaim_probability_threshold = 0.6
+        assert self.assessor._score_leak_sites(site_stats) == [
+            "Likely leak (50%): +2.0MB at pool.py:7"
+        ]
+
+
+class TestResourcePeaks:
+    """Tests for the monitor-written peaks and their per-interval epochs."""
+
+    def test_peaks_accumulate_without_epochs(self):
+        """Test that load tests, which never start an epoch, keep the overall maximum."""
+        peaks = ResourcePeaks()
+        for memory, cpu in ((120.0, 30.0), (150.0, 10.0), (140.0, 80.0)):
+            peaks.record(peaks.epoch.value, memory, cpu)
+
+        assert (peaks.memory.value, peaks.cpu.value) == (150.0, 80.0)
+
+    def test_new_epoch_restarts_the_memory_peak(self):
+        """Test that a slice only sees samples taken after its epoch started."""
+        peaks = ResourcePeaks()
+        peaks.record(peaks.epoch.value, 500.0, 0.0)
+
+        first = peaks.new_epoch()
+        assert peaks.memory_peak_since(first) is None
+
+        peaks.record(first, 120.0, 0.0)
+        peaks.record(first, 130.0, 0.0)
+        assert peaks.memory_peak_since(first) == 130.0
+
+        second = peaks.new_epoch()
+        # A sample that read the old epoch before the caller moved on doesn't count
+        peaks.record(first, 900.0, 0.0)
+        assert peaks.memory_peak_since(second) is None
+
+        peaks.record(second, 110.0, 0.0)
+        assert peaks.memory_peak_since(second) == 110.0
+        assert peaks.memory_peak_since(first) is None
+
+    def test_profiled_slices_report_own_process_peaks(self):
+        """Test that each profiled slice's peak is bounded by its own RSS readings."""
+        assessor = PerformanceAssessor()
+        metrics = assessor.profile_order_processing_batched([[], [], []], routes=[], trucks=[])
+
+        for m in metrics:
+            data = m.additional_data
+            assert data['peak_memory_mb'] >= data['pre_release_memory_mb']
+            assert data['peak_memory_mb'] - data['pre_release_memory_mb'] < 50
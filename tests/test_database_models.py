@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the distance helpers on the database models
+Tests Location.distances_to_many and the Route path distance calculations.
+"""
+
+import unittest
+
+import numpy as np
+
+from app.database import Location, Route
+
+
+class TestLocationDistances(unittest.TestCase):
+    """Test vectorized Location distance helpers"""
+
+    def test_distances_to_many_matches_distance_to(self):
+        """Test the vectorized distances against pairwise distance_to"""
+        atlanta = Location(lat=33.7490, lng=-84.3880)
+        others = [
+            Location(lat=33.4735, lng=-82.0105),
+            Location(lat=32.0835, lng=-81.0998),
+            Location(lat=31.5804, lng=-84.1557),
+            Location(lat=33.7490, lng=-84.3880),
+        ]
+
+        distances = Location.distances_to_many(
+            atlanta.lat, atlanta.lng, [o.lat for o in others], [o.lng for o in others]
+        )
+
+        self.assertEqual(distances.shape, (4,))
+        np.testing.assert_allclose(distances, [atlanta.distance_to(o) for o in others], atol=1e-9)
+        self.assertEqual(distances[3], 0.0)
+
+
+class TestRoutePathDistances(unittest.TestCase):
+    """Test Route distance and proximity calculations over path waypoints"""
+
+    def setUp(self):
+        self.origin = Location(lat=33.0, lng=-84.0)
+        self.waypoint = Location(lat=33.5, lng=-84.0)
+        self.destiny = Location(lat=34.0, lng=-84.0)
+        self.route = Route(location_origin_id=1, location_destiny_id=2)
+        self.route.location_origin = self.origin
+        self.route.location_destiny = self.destiny
+        self.route.set_path([self.origin, self.waypoint, self.destiny])
+
+    def _pairwise_total(self):
+        path = self.route.path
+        return sum(a.distance_to(b) for a, b in zip(path, path[1:]))
+
+    def test_total_distance_matches_pairwise_sum(self):
+        """Test total_distance against summing distance_to over the legs"""
+        self.assertAlmostEqual(self.route.total_distance(), self._pairwise_total(), places=6)
+        self.assertAlmostEqual(self.route.total_distance(), 111.19, places=2)
+
+    def test_total_distance_follows_waypoint_changes(self):
+        """Test that moved or replaced waypoints are picked up"""
+        before = self.route.total_distance()
+
+        self.waypoint.lng = -80.0
+        self.assertGreater(self.route.total_distance(), before + 100)
+        self.assertAlmostEqual(self.route.total_distance(), self._pairwise_total(), places=6)
+
+        self.route.path[1] = Location(lat=33.5, lng=-84.0)
+        self.assertAlmostEqual(self.route.total_distance(), before, places=6)
+
+    def test_is_within_km(self):
+        """Test proximity against endpoints and waypoints"""
+        self.assertTrue(self.route.is_within_km((33.5, -84.005)))
+        self.assertTrue(self.route.is_within_km(Location(lat=34.0, lng=-84.0)))
+        self.assertFalse(self.route.is_within_km((33.25, -84.0)))
+        self.assertTrue(self.route.is_within_km((33.25, -84.0), km=30.0))
+        self.assertFalse(self.route.is_within_km((33.5, -80.0)))
+
+    def test_is_within_km_across_antimeridian(self):
+        """Test that the longitude prefilter wraps around +/-180 degrees"""
+        route = Route(location_origin_id=1, location_destiny_id=2)
+        route.location_origin = Location(lat=-17.0, lng=179.9995)
+        route.location_destiny = Location(lat=-17.5, lng=178.0)
+        route.set_path([route.location_origin, Location(lat=-16.5, lng=-179.9990),
+                        route.location_destiny])
+
+        self.assertTrue(route.is_within_km((-17.0, -179.9995)))
+        self.assertTrue(route.is_within_km(Location(lat=-16.5, lng=179.9995)))
+        self.assertFalse(route.is_within_km((-17.0, -179.9)))
+
+    def test_proximity_follows_waypoint_and_endpoint_changes(self):
+        """Test that the latitude index is rebuilt when points move"""
+        stop = (33.5, -80.0)
+        self.assertFalse(self.route.is_within_km(stop))
+        self.assertGreater(self.route.deviation_time_for_stop(stop), 15.0)
+
+        self.waypoint.lng = -80.0
+        self.assertTrue(self.route.is_within_km(stop))
+        self.assertEqual(self.route.deviation_time_for_stop(stop), 15.0)
+
+        self.route.path[1] = Location(lat=33.5, lng=-84.0)
+        self.assertFalse(self.route.is_within_km(stop))
+
+        self.destiny.lat, self.destiny.lng = stop
+        self.assertTrue(self.route.is_within_km(stop))
+        self.assertEqual(self.route.deviation_time_for_stop(stop), 15.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -74,6 +74,19 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertEqual(counts['trucks'], 1)
         self.assertEqual(counts['routes'], 0)
 
+    def test_get_counts_matches_existing_data(self):
+        """Test counting rows without loading them"""
+        self.session.add(Client(name="Test Client"))
+        self.session.add(Location(lat=33.7490, lng=-84.3880, marked=True))
+        self.session.add(Location(lat=32.0835, lng=-81.0998, marked=True))
+        self.session.commit()
+
+        _, expected_counts = self.db_manager.check_existing_data()
+        counts = self.db_manager.get_counts()
+
+        self.assertEqual(counts, expected_counts)
+        self.assertEqual(counts['locations'], 2)
+
     def test_is_database_initialized_false(self):
         """Test database initialization check with insufficient data"""
         existing_data, counts = self.db_manager.check_existing_data()
@@ -216,6 +229,19 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertEqual(len(trucks), 5)
         self.assertEqual(len(self.db_manager.trucks), 5)
 
+    def test_ensure_trucks_matches_prefix_case_sensitively(self):
+        """Test that only trucks with the exact contract prefix are reused"""
+        self.session.add(Truck(autonomy=800.0, capacity=48.0, type="specialized contract truck #1"))
+        self.session.add(Truck(autonomy=800.0, capacity=48.0, type="Specialized Contract Truck #1"))
+        self.session.commit()
+
+        self.db_manager._ensure_trucks()
+
+        self.assertEqual(len(self.db_manager.trucks), 5)
+        self.assertTrue(all(t.type.startswith("Specialized Contract Truck #")
+                            for t in self.db_manager.trucks))
+        self.assertEqual(len(self.session.exec(select(Truck)).all()), 6)
+
     def test_verify_integrity_clean_database(self):
         """Test integrity verification on clean database"""
         counts = self.db_manager.verify_integrity()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the compiled geometry kernels in utils.geom
+Tests the distance kernels against Location.distance_to and at antipodal points.
+"""
+
+import math
+import unittest
+
+import numpy as np
+
+from app.database import Location
+from utils import geom
+
+HALF_CIRCUMFERENCE_KM = math.pi * geom.EARTH_RADIUS_KM
+
+
+def _interpreted(kernel):
+    """The kernel's Python source, whether or not Numba compiled it"""
+    return getattr(kernel, 'py_func', kernel)
+
+
+class TestDistanceKernels(unittest.TestCase):
+    """Test the haversine kernels and path_length"""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.lat = rng.uniform(-89.0, 89.0, 2000)
+        self.lng = rng.uniform(-180.0, 180.0, 2000)
+
+    def test_kernels_match_distance_to(self):
+        """Test the kernels against Location.distance_to for Georgia cities"""
+        cities = [
+            Location(lat=33.7490, lng=-84.3880),
+            Location(lat=32.0835, lng=-81.0998),
+            Location(lat=34.7465, lng=-83.3782),
+            Location(lat=31.5804, lng=-84.1557),
+        ]
+        lat = np.array([c.lat for c in cities])
+        lng = np.array([c.lng for c in cities])
+        expected = np.array([[a.distance_to(b) for b in cities] for a in cities])
+
+        np.testing.assert_allclose(geom.haversine_matrix(lat, lng, lat, lng), expected, atol=1e-9)
+        np.testing.assert_allclose(geom.compute_distance_matrix(cities, cities), expected, atol=1e-9)
+        np.testing.assert_allclose(
+            geom.haversine_pairwise(lat[:-1], lng[:-1], lat[1:], lng[1:]),
+            expected.diagonal(1), atol=1e-9
+        )
+        self.assertAlmostEqual(geom.path_length(lat, lng), expected.diagonal(1).sum(), places=9)
+
+    def test_antipodal_points_are_finite(self):
+        """Test that (near-)antipodal pairs give half the circumference, never NaN"""
+        anti_lat = -self.lat
+        anti_lng = self.lng + 180.0
+        for pairwise in (geom.haversine_pairwise, _interpreted(geom.haversine_pairwise)):
+            distances = pairwise(self.lat, self.lng, anti_lat, anti_lng)
+            self.assertFalse(np.isnan(distances).any())
+            np.testing.assert_allclose(distances, HALF_CIRCUMFERENCE_KM, rtol=1e-7)
+
+        matrix = geom.haversine_matrix(self.lat[:50], self.lng[:50], anti_lat[:50], anti_lng[:50])
+        self.assertFalse(np.isnan(matrix).any())
+        np.testing.assert_allclose(matrix.diagonal(), HALF_CIRCUMFERENCE_KM, rtol=1e-7)
+
+        there_and_back = geom.path_length(
+            np.array([self.lat[0], anti_lat[0], self.lat[0]]),
+            np.array([self.lng[0], anti_lng[0], self.lng[0]])
+        )
+        self.assertAlmostEqual(there_and_back, 2 * HALF_CIRCUMFERENCE_KM, places=4)
+
+    def test_compiled_matches_interpreted(self):
+        """Test that fastmath compilation stays within rounding of the Python source"""
+        args = (self.lat[:-1], self.lng[:-1], self.lat[1:], self.lng[1:])
+        np.testing.assert_allclose(
+            geom.haversine_pairwise(*args), _interpreted(geom.haversine_pairwise)(*args), rtol=1e-12
+        )
+
+
+class TestProximityMask(unittest.TestCase):
+    """Test the order/route proximity kernel"""
+
+    def test_antipodal_and_nan_orders(self):
+        """Test that antipodal orders match only a whole-globe radius and NaN never matches"""
+        route_lat = np.array([33.7490, 32.0835])
+        route_lng = np.array([-84.3880, -81.0998])
+        offsets = np.array([0, 2], dtype=np.int64)
+        pick_lat = np.array([-33.7490, np.nan])
+        pick_lng = np.array([95.6120, -84.3880])
+        drop_lat = np.array([-32.0835, 33.7490])
+        drop_lng = np.array([98.9002, -84.3880])
+
+        near = geom.proximity_mask(pick_lat, pick_lng, drop_lat, drop_lng,
+                                   route_lat, route_lng, offsets, 1.0)
+        whole_globe = geom.proximity_mask(pick_lat, pick_lng, drop_lat, drop_lng,
+                                          route_lat, route_lng, offsets, HALF_CIRCUMFERENCE_KM + 1.0)
+
+        self.assertEqual(near.tolist(), [[False], [False]])
+        self.assertEqual(whole_globe.tolist(), [[True], [False]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,8 @@ Tests all validation constraints and business rules:
 import unittest
 from unittest.mock import patch
 
+import numpy as np
+
 from order_processor import (
     OrderProcessor,
     OrderProcessingConstants,
@@ -18,7 +20,9 @@ from order_processor import (
     ValidationError,
     ProcessingResult
 )
-from schemas.schemas import Order, Route, Truck, Location, Cargo, Package, CargoType
+from schemas.schemas import (
+    Order, Route, Truck, Location, LocationCore, Cargo, Package, CargoType, create_orders_from_dicts
+)
 
 
 class TestOrderProcessingConstants(unittest.TestCase):
@@ -199,6 +203,39 @@ class TestCapacityValidation(unittest.TestCase):
         result = self.processor._validate_capacity_constraint(order, self.truck)
         self.assertIsNone(result)
 
+    def test_cargo_totals_follow_package_changes(self):
+        """Test cached cargo totals after add_package and reassignment"""
+        cargo = Cargo(order_id=1, packages=[self.small_package])
+        self.assertEqual(cargo.total_volume(), 1.0)
+
+        cargo.add_package(self.large_package)
+        self.assertEqual(cargo.total_volume(), 51.0)
+        self.assertEqual(cargo.total_weight(), 1025.0)
+        self.assertEqual(len(cargo.packages), 2)
+
+        cargo.packages = [self.large_package]
+        self.assertEqual(cargo.total_volume(), 50.0)
+        self.assertEqual(cargo.total_weight(), 1000.0)
+
+        fragile = Package(volume=2.0, weight=5.0, type=CargoType.FRAGILE)
+        cargo.add_package(fragile)
+        self.assertEqual(cargo.get_types(), {CargoType.STANDARD, CargoType.FRAGILE})
+
+        cargo.packages.remove(fragile)
+        cargo.invalidate()
+        self.assertEqual(cargo.get_types(), {CargoType.STANDARD})
+        self.assertEqual(cargo.total_volume(), 50.0)
+
+    def test_truck_capacity_stats(self):
+        """Test that capacity_stats agrees with the individual queries"""
+        self.truck.cargo_loads = [Cargo(order_id=1, packages=[self.small_package] * 12)]
+
+        used, available, percent = self.truck.capacity_stats()
+        self.assertEqual(used, self.truck.total_cargo_volume())
+        self.assertEqual(available, self.truck.available_capacity())
+        self.assertEqual(percent, self.truck.utilization_percent())
+        self.assertEqual((used, available, percent), (12.0, 36.0, 25.0))
+
     def test_invalid_volume_capacity(self):
         """Test order that exceeds volume capacity"""
         cargo = Cargo(order_id=1, packages=[self.large_package])
@@ -372,6 +409,48 @@ class TestCargoCompatibility(unittest.TestCase):
         self.assertEqual(result.result, ValidationResult.INCOMPATIBLE_CARGO)
         self.assertIn("Incompatible cargo types", result.message)
 
+    def test_cargo_is_compatible_with_checks_across_cargos(self):
+        """Test that only type pairs split across the two cargos conflict"""
+        mixed = Cargo(order_id=3, packages=[
+            Package(volume=1.0, weight=1.0, type=CargoType.HAZMAT),
+            Package(volume=1.0, weight=1.0, type=CargoType.FRAGILE),
+        ])
+        standard = Cargo(order_id=4, packages=[
+            Package(volume=1.0, weight=1.0, type=CargoType.STANDARD),
+        ])
+        refrigerated = Cargo(order_id=5, packages=[
+            Package(volume=1.0, weight=1.0, type=CargoType.REFRIGERATED),
+        ])
+
+        self.assertTrue(mixed.is_compatible_with(standard))
+        self.assertTrue(standard.is_compatible_with(mixed))
+        self.assertFalse(mixed.is_compatible_with(refrigerated))
+        self.assertFalse(refrigerated.is_compatible_with(mixed))
+        self.assertTrue(standard.is_compatible_with(refrigerated))
+
+    def test_truck_type_cargo_masks(self):
+        """Test truck type rules for every truck type and cargo type"""
+        expected_allowed = {
+            "standard": {CargoType.STANDARD, CargoType.FRAGILE},
+            "refrigerated": {CargoType.STANDARD, CargoType.FRAGILE, CargoType.REFRIGERATED},
+            "hazmat": {CargoType.STANDARD, CargoType.FRAGILE, CargoType.HAZMAT},
+        }
+        for truck_type, allowed in expected_allowed.items():
+            truck = Truck(autonomy=800.0, capacity=48.0, type=truck_type)
+            for cargo_type in CargoType:
+                cargo = Cargo(order_id=1)
+                cargo.add_package(Package(volume=1.0, weight=1.0, type=cargo_type))
+                with self.subTest(truck=truck_type, cargo=cargo_type):
+                    self.assertEqual(truck.is_compatible_with_cargo(cargo), cargo_type in allowed)
+
+        mixed = Cargo(order_id=1, packages=[
+            Package(volume=1.0, weight=1.0, type=CargoType.HAZMAT),
+            Package(volume=1.0, weight=1.0, type=CargoType.REFRIGERATED),
+        ])
+        for truck_type in expected_allowed:
+            truck = Truck(autonomy=800.0, capacity=48.0, type=truck_type)
+            self.assertFalse(truck.is_compatible_with_cargo(mixed))
+
     def test_empty_cargo(self):
         """Test order with no cargo"""
         order = Order(
@@ -384,6 +463,65 @@ class TestCargoCompatibility(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestRouteDistance(unittest.TestCase):
+    """Test route path distance totals"""
+
+    def test_vectorized_path_matches_pairwise_sum(self):
+        """Test the NumPy path total against summing Location.distance_to"""
+        path = [
+            Location(lat=33.7490, lng=-84.3880),
+            Location(lat=33.4735, lng=-82.0105),
+            Location(lat=32.0835, lng=-81.0998),
+            Location(lat=31.5785, lng=-84.1557),
+            Location(lat=34.7500, lng=-85.3890),
+        ]
+        route = Route(location_origin_id=1, location_destiny_id=2, path=path)
+
+        expected = sum(a.distance_to(b) for a, b in zip(path, path[1:]))
+        self.assertAlmostEqual(route.total_distance(), expected, places=6)
+
+        short = Route(location_origin_id=1, location_destiny_id=2, path=path[:2])
+        self.assertAlmostEqual(short.total_distance(), path[0].distance_to(path[1]), places=9)
+
+    def test_location_core_matches_location(self):
+        """Test that the slotted LocationCore gives the same distances"""
+        atlanta = Location(lat=33.7490, lng=-84.3880)
+        savannah = Location(lat=32.0835, lng=-81.0998)
+
+        core = atlanta.core()
+        self.assertIsInstance(core, LocationCore)
+        self.assertIs(core, atlanta.core())
+        self.assertEqual((core.lat, core.lng), atlanta.coordinates)
+        self.assertEqual(core.distance_to(savannah), atlanta.distance_to(savannah))
+        self.assertEqual(core.distance_to(savannah.core()), atlanta.distance_to(savannah))
+
+
+class TestOrderFactory(unittest.TestCase):
+    """Test building schema orders from legacy dictionaries"""
+
+    def test_batch_shares_locations(self):
+        """Test that repeated coordinates map to one Location instance"""
+        def order_data(pickup, dropoff):
+            return {
+                'pick-up': {'latitude': pickup[0], 'longitude': pickup[1]},
+                'drop-off': {'latitude': dropoff[0], 'longitude': dropoff[1]},
+                'cargo': {'packages': [[1.0, 25.0, 'standard']]}
+            }
+
+        atlanta, augusta, savannah = (33.7490, -84.3880), (33.4735, -82.0105), (32.0835, -81.0998)
+        cache = {}
+        first, second = create_orders_from_dicts(
+            [order_data(atlanta, augusta), order_data(atlanta, savannah)], location_cache=cache
+        )
+        (third,) = create_orders_from_dicts([order_data(augusta, atlanta)], location_cache=cache)
+
+        self.assertIs(first.location_origin, second.location_origin)
+        self.assertIs(third.location_origin, first.location_destiny)
+        self.assertIs(third.location_destiny, first.location_origin)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(first.total_volume(), 1.0)
+
+
 class TestOrderMetrics(unittest.TestCase):
     """Test order metrics calculation"""
 
@@ -435,6 +573,18 @@ class TestOrderMetrics(unittest.TestCase):
             self.assertIn(metric, metrics)
             self.assertIsInstance(metrics[metric], (int, float))
 
+    def test_score_level_metrics(self):
+        """Test that score-level metrics only carry the efficiency score inputs"""
+        full = self.processor._calculate_order_metrics(self.order, self.route, self.truck)
+        score = self.processor._calculate_order_metrics(self.order, self.route, self.truck, level="score")
+
+        self.assertEqual(set(score), {
+            'volume_utilization_percent', 'weight_utilization_percent',
+            'deviation_distance_miles', 'additional_cost_usd'
+        })
+        for metric, value in score.items():
+            self.assertAlmostEqual(value, full[metric])
+
     def test_unit_conversions(self):
         """Test that unit conversions are correct"""
         metrics = self.processor._calculate_order_metrics(self.order, self.route, self.truck)
@@ -516,6 +666,53 @@ class TestBatchProcessing(unittest.TestCase):
             self.assertIsInstance(result.errors, list)
             self.assertIsInstance(result.metrics, dict)
 
+    def test_proximity_screen_matches_exhaustive_search(self):
+        """Skipping pairs that fail the proximity screen must not change results"""
+        far_cargo = Cargo(order_id=3, packages=[Package(volume=1.0, weight=25.0, type=CargoType.STANDARD)])
+        orders = self.orders + [
+            Order(
+                id=3,
+                location_origin_id=1,
+                location_destiny_id=2,
+                location_origin=Location(lat=32.0835, lng=-81.0998),
+                location_destiny=Location(lat=34.7500, lng=-85.3890),
+                cargo=[far_cargo]
+            ),
+            Order(id=4, location_origin_id=1, location_destiny_id=2)
+        ]
+
+        route_points = self.processor.route_point_arrays(self.routes)
+        mask = self.processor._proximity_candidates(orders, route_points)
+        # Order 2 is 1.24km from the route start, order 3 starts in Savannah
+        self.assertEqual(mask.tolist(), [[True], [False], [False], [False]])
+
+        screened = self.processor.process_order_batch(orders, self.routes, self.trucks)
+        with patch.object(self.processor, '_proximity_candidates',
+                          side_effect=lambda o, p: np.ones((len(o), len(p[2]) - 1), dtype=bool)):
+            exhaustive = self.processor.process_order_batch(orders, self.routes, self.trucks)
+        precomputed = self.processor.process_order_batch(orders, self.routes, self.trucks,
+                                                         route_points=route_points)
+
+        for order_id, result in screened.items():
+            self.assertEqual(result.is_valid, precomputed[order_id].is_valid)
+            self.assertEqual(result.is_valid, exhaustive[order_id].is_valid)
+            self.assertEqual(result.metrics, exhaustive[order_id].metrics)
+            self.assertEqual([e.message for e in result.errors],
+                             [e.message for e in exhaustive[order_id].errors])
+
+    def test_no_resources_results_are_independent(self):
+        """Each order gets its own rejection when there are no routes or trucks"""
+        for process in (self.processor.process_order_batch, self.processor.process_order_batch_v2):
+            results = process(self.orders, [], self.trucks)
+            first, second = results[1], results[2]
+
+            self.assertFalse(first.is_valid)
+            self.assertIsNot(first, second)
+            first.metrics['note'] = 'edited'
+            first.errors.clear()
+            self.assertEqual(second.metrics, {})
+            self.assertEqual([e.message for e in second.errors], ["No routes or trucks available"])
+
     def test_efficiency_scoring(self):
         """Test efficiency scoring for route selection"""
         # Test with metrics that should give a good score
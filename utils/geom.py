@@ -0,0 +1,192 @@
+"""
+Compiled geometry kernels for the freight network.
+
+Numba is an optional dependency: when it is installed the kernels below are
+JIT-compiled (and cached on disk), otherwise the same Python source runs
+unchanged. The distance kernels use fastmath, so compiled results can
+differ from the interpreted ones in the last few ulps; each clamps the
+haversine term to 1 so rounding near antipodal points can't produce NaN.
+
+The kernels are compiled without parallel=True. Load tests already spread
+work over forked processes, and once Numba's threading layer has started,
+fork() is unsafe (GNU OpenMP aborts, TBB hangs the parent at exit).
+"""
+
+import logging
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+
+
+@njit(cache=True, fastmath=True)
+def haversine_matrix(lat1, lng1, lat2, lng2):
+    """
+    Great-circle distances in kilometers between every point of set 1
+    (M points) and every point of set 2 (N points), as an (M, N) matrix.
+    Coordinates are 1-D float arrays in decimal degrees.
+    """
+    m = lat1.shape[0]
+    n = lat2.shape[0]
+    out = np.empty((m, n))
+    deg = np.pi / 180.0
+    for i in range(m):
+        phi1 = lat1[i] * deg
+        lam1 = lng1[i] * deg
+        cos_phi1 = np.cos(phi1)
+        for j in range(n):
+            phi2 = lat2[j] * deg
+            sin_dphi = np.sin((phi2 - phi1) * 0.5)
+            sin_dlam = np.sin((lng2[j] * deg - lam1) * 0.5)
+            a = sin_dphi * sin_dphi + cos_phi1 * np.cos(phi2) * sin_dlam * sin_dlam
+            if a > 1.0:
+                a = 1.0
+            out[i, j] = 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def haversine_pairwise(lat1, lng1, lat2, lng2):
+    """
+    Element-wise great-circle distances in kilometers between matching
+    points of two equally sized coordinate arrays (decimal degrees).
+    """
+    n = lat1.shape[0]
+    out = np.empty(n)
+    deg = np.pi / 180.0
+    for i in range(n):
+        phi1 = lat1[i] * deg
+        phi2 = lat2[i] * deg
+        sin_dphi = np.sin((phi2 - phi1) * 0.5)
+        sin_dlam = np.sin((lng2[i] - lng1[i]) * deg * 0.5)
+        a = sin_dphi * sin_dphi + np.cos(phi1) * np.cos(phi2) * sin_dlam * sin_dlam
+        if a > 1.0:
+            a = 1.0
+        out[i] = 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def path_length(lat, lng):
+    """
+    Total great-circle length in kilometers of the path through the points
+    of two equally sized coordinate arrays (decimal degrees), in order.
+    """
+    total = 0.0
+    deg = np.pi / 180.0
+    for i in range(lat.shape[0] - 1):
+        phi1 = lat[i] * deg
+        phi2 = lat[i + 1] * deg
+        sin_dphi = np.sin((phi2 - phi1) * 0.5)
+        sin_dlam = np.sin((lng[i + 1] - lng[i]) * deg * 0.5)
+        a = sin_dphi * sin_dphi + np.cos(phi1) * np.cos(phi2) * sin_dlam * sin_dlam
+        if a > 1.0:
+            a = 1.0
+        total += 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+    return total
+
+
+@njit(cache=True)
+def point_in_polygon(lat, lng, poly_lat, poly_lng):
+    """
+    Ray-casting test of whether (lat, lng) lies inside the polygon given by
+    its vertex arrays (the polygon is closed implicitly).
+    """
+    inside = False
+    n = poly_lat.shape[0]
+    j = n - 1
+    for i in range(n):
+        yi = poly_lat[i]
+        yj = poly_lat[j]
+        if (yi > lat) != (yj > lat):
+            x_cross = poly_lng[i] + (lat - yi) * (poly_lng[j] - poly_lng[i]) / (yj - yi)
+            if lng < x_cross:
+                inside = not inside
+        j = i
+    return inside
+
+
+@njit(cache=True, fastmath=False)
+def proximity_mask(pick_lat, pick_lng, drop_lat, drop_lng,
+                   point_lat, point_lng, route_offsets, max_km):
+    """
+    Which (order, route) pairs have both the pickup and the dropoff within
+    max_km of some point of the route, as an (orders, routes) bool matrix.
+
+    Route r's points are point_lat/point_lng[route_offsets[r]:route_offsets[r + 1]].
+    NaN order coordinates never match.
+    """
+    n_orders = pick_lat.shape[0]
+    n_routes = route_offsets.shape[0] - 1
+    out = np.zeros((n_orders, n_routes), dtype=np.bool_)
+    deg = np.pi / 180.0
+    for i in range(n_orders):
+        for r in range(n_routes):
+            pick_ok = False
+            drop_ok = False
+            for p in range(route_offsets[r], route_offsets[r + 1]):
+                phi = point_lat[p] * deg
+                cos_phi = np.cos(phi)
+                if not pick_ok:
+                    phi1 = pick_lat[i] * deg
+                    sin_dphi = np.sin((phi - phi1) * 0.5)
+                    sin_dlam = np.sin((point_lng[p] - pick_lng[i]) * deg * 0.5)
+                    a = sin_dphi * sin_dphi + np.cos(phi1) * cos_phi * sin_dlam * sin_dlam
+                    if a > 1.0:
+                        a = 1.0
+                    pick_ok = 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a)) <= max_km
+                if not drop_ok:
+                    phi1 = drop_lat[i] * deg
+                    sin_dphi = np.sin((phi - phi1) * 0.5)
+                    sin_dlam = np.sin((point_lng[p] - drop_lng[i]) * deg * 0.5)
+                    a = sin_dphi * sin_dphi + np.cos(phi1) * cos_phi * sin_dlam * sin_dlam
+                    if a > 1.0:
+                        a = 1.0
+                    drop_ok = 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a)) <= max_km
+                if pick_ok and drop_ok:
+                    break
+            out[i, r] = pick_ok and drop_ok
+    return out
+
+
+def compute_distance_matrix(a_locs, b_locs):
+    """
+    Great-circle distances in kilometers between two lists of objects with
+    lat/lng attributes (e.g. Location), as a (len(a_locs), len(b_locs)) matrix
+    """
+    a_lat = np.array([loc.lat for loc in a_locs], dtype=np.float64)
+    a_lng = np.array([loc.lng for loc in a_locs], dtype=np.float64)
+    b_lat = np.array([loc.lat for loc in b_locs], dtype=np.float64)
+    b_lng = np.array([loc.lng for loc in b_locs], dtype=np.float64)
+    return haversine_matrix(a_lat, a_lng, b_lat, b_lng)
+
+
+def _warm_up():
+    """Trigger JIT compilation once at import so callers don't pay it in hot paths"""
+    pts = np.array([33.7490, 33.4735])
+    haversine_matrix(pts, pts, pts, pts)
+    haversine_pairwise(pts, pts, pts, pts)
+    path_length(pts, pts)
+    point_in_polygon(33.6, 33.6, pts, pts)
+    proximity_mask(pts, pts, pts, pts, pts, pts, np.array([0, 2], dtype=np.int64), 1.0)
+
+
+if NUMBA_AVAILABLE:
+    try:
+        _warm_up()
+    except Exception as e:  # compilation problems must not break importers
+        logger.warning(f"Numba warm-up failed, kernels will compile on first use: {e}")